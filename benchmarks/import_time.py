@@ -0,0 +1,67 @@
+"""Замер времени и памяти импорта пакета.
+
+Каждый замер выполняется в новом процессе интерпретатора, чтобы модули не
+брались из sys.modules. Для сравнения замеряется и импорт самого httpx.
+
+Запуск:
+    python benchmarks/import_time.py --runs 20
+"""
+
+import argparse
+import json
+import statistics
+import subprocess  # noqa: S404
+import sys
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "heavy_modules": sorted(
+        name for name in ("allure", "curlify2", "sqlite3", "asyncio", "concurrent.futures") if name in sys.modules
+    ),
+}}))
+"""
+
+
+def measure(module: str, runs: int) -> dict[str, object]:
+    """Замеряет импорт модуля в runs новых процессах.
+
+    Args:
+        module: Имя импортируемого модуля
+        runs: Число запусков
+
+    Returns:
+        Медианы времени и памяти и список тяжелых модулей, загруженных при импорте.
+    """
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", PROBE.format(module=module)], capture_output=True, check=True, text=True
+        ).stdout
+        samples.append(json.loads(output))
+
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(sample["seconds"] for sample in samples) * 1000, 2),
+        "median_max_rss_kb": statistics.median(sample["max_rss_kb"] for sample in samples),
+        "heavy_modules": samples[0]["heavy_modules"],
+    }
+
+
+def main() -> None:
+    """Печатает результаты замеров для httpx и pt_http_client."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Число запусков для каждого модуля")
+    args = parser.parse_args()
+
+    for module in ("httpx", "pt_http_client"):
+        print(json.dumps(measure(module, args.runs), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Замер накладных расходов LoggingHandler на один запрос.
+
+Запросы выполняются через httpx.MockTransport, поэтому сеть не влияет на
+результат. Сравниваются клиент без обработчиков и LoggingHandler при уровне
+логгера INFO (подробности ответа не пишутся) и DEBUG (пишутся с телом).
+
+Запуск:
+    python benchmarks/logging_overhead.py --requests 2000 --body-items 500
+"""
+
+import argparse
+import io
+import json
+import logging
+import time
+
+import httpx
+
+from pt_http_client import HttpClient
+from pt_http_client.event_hooks.logging_handler import LoggingHandler
+
+
+def measure(name: str, level: int | None, requests: int, body: bytes) -> dict[str, object]:
+    """Замеряет среднее время запроса.
+
+    Args:
+        name: Название варианта
+        level: Уровень логгера или None для клиента без обработчиков
+        requests: Число запросов
+        body: Тело ответа
+
+    Returns:
+        Среднее время запроса в микросекундах и объем записанного лога.
+    """
+    output = io.StringIO()
+    logger = logging.getLogger(f"benchmark.{name}")
+    logger.propagate = False
+    logger.addHandler(logging.StreamHandler(output))
+    logger.setLevel(level or logging.CRITICAL)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(httpx.codes.OK, stream=httpx.ByteStream(body))
+
+    handlers = [LoggingHandler(logger=logger)] if level is not None else [_NoopHandler()]
+    with HttpClient(base_url="https://api.example.com", handlers=handlers, transport=httpx.MockTransport(handler)) as c:
+        c.get("/warmup")
+        started = time.perf_counter()
+        for i in range(requests):
+            c.get(f"/users/{i}", params={"page": i})
+        elapsed = time.perf_counter() - started
+
+    return {
+        "variant": name,
+        "per_request_us": round(elapsed / requests * 1_000_000, 1),
+        "log_bytes": len(output.getvalue()),
+    }
+
+
+class _NoopHandler(LoggingHandler):
+    """Обработчик без действий для базового замера."""
+
+    def request_hook(self, request: httpx.Request) -> None:
+        """Ничего не делает."""
+
+    def response_hook(self, response: httpx.Response) -> None:
+        """Ничего не делает."""
+
+
+def main() -> None:
+    """Печатает результаты замеров для каждого варианта."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Число запросов в каждом варианте")
+    parser.add_argument("--body-items", type=int, default=500, help="Число элементов в JSON теле ответа")
+    args = parser.parse_args()
+
+    body = json.dumps([{"id": i, "name": f"user{i}"} for i in range(args.body_items)]).encode()
+    for name, level in (("no_handlers", None), ("info", logging.INFO), ("debug", logging.DEBUG)):
+        print(json.dumps(measure(name, level, args.requests, body), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
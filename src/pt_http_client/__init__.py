@@ -1,7 +1,14 @@
+from .async_client import AsyncHttpClient
 from .auth.bearer import BearerTokenAuth
-from .client import HttpClient
+from .body import parsed_body
+from .client import HttpClient, RequestSpec
+from .codec import JsonCodec
 
 __all__ = [
+    "AsyncHttpClient",
     "BearerTokenAuth",
     "HttpClient",
+    "JsonCodec",
+    "RequestSpec",
+    "parsed_body",
 ]
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import types
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+import httpx
+
+from .base_client import BaseHttpClient
+
+type AsyncRetryDecorator = Callable[
+    [Callable[[], Awaitable[httpx.Response]]],
+    Callable[[], Awaitable[httpx.Response]],
+]
+
+
+class AsyncHttpClient(BaseHttpClient[httpx.AsyncClient]):
+    """HTTP клиент для выполнения асинхронных запросов.
+
+    Асинхронный аналог HttpClient на базе httpx.AsyncClient с тем же
+    конструктором и набором методов. Позволяет одному воркеру держать
+    в полете сотни запросов через общий пул соединений.
+
+    Основные возможности:
+        - Автоматическое создание и закрытие соединения
+        - Поддержка всех HTTP методов (GET, POST, PUT, PATCH, DELETE)
+        - Передача параметров запроса (params, json, headers)
+        - Интеграция с retry декораторами (tenacity поддерживает корутины)
+        - Асинхронный контекстный менеджер для безопасной работы
+        - Запросы от разных пользователей через один пул соединений (параметр user)
+        - Потоковое чтение больших ответов (stream)
+        - Обработчики событий через AbstractHookHandler.async_request_hook/async_response_hook
+
+    Атрибуты:
+        base_url: Базовый URL для всех запросов
+        timeout: Таймаут запроса по умолчанию в секундах
+        verify: Флаг проверки SSL сертификатов
+        auth: Объект аутентификации httpx
+        default_headers: Заголовки по умолчанию для всех запросов
+        client_kwargs: Дополнительные параметры для httpx.AsyncClient
+
+    Примеры:
+        >>> async with AsyncHttpClient(base_url="https://api.example.com") as client:
+        ...     responses = await asyncio.gather(*(client.get(f"/users/{i}") for i in range(100)))
+    """
+
+    async def __aenter__(self) -> AsyncHttpClient:
+        self._setup_client()
+        return self
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc_val: BaseException | None, exc_tb: types.TracebackType | None
+    ) -> None:
+        await self.aclose()
+
+    def _update_client_hooks(self) -> None:
+        """Обновляет event_hooks существующего клиента."""
+        if self._client:
+            request_hooks = [self._async_codec_request_hook, *(hook.async_request_hook for hook in self._handlers)]
+            response_hooks = [hook.async_response_hook for hook in self._handlers]
+
+            self._client.event_hooks["request"] = request_hooks
+            self._client.event_hooks["response"] = response_hooks
+
+    async def _async_codec_request_hook(self, request: httpx.Request) -> None:
+        """Передает кодек JSON клиента обработчикам через request.extensions."""
+        self._codec_request_hook(request)
+
+    def _setup_client(self) -> httpx.AsyncClient:
+        """Создает клиент httpx если он еще не создан.
+
+        Returns:
+            Экземпляр httpx.AsyncClient, готовый к использованию.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                verify=self.verify,
+                auth=self.auth,
+                headers=self.default_headers,
+                **self.client_kwargs,
+            )
+            self._update_client_hooks()
+
+        return self._client
+
+    async def aclose(self) -> None:
+        """Закрытие клиента httpx и обработчиков событий."""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+            self._close_handlers()
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        retry: AsyncRetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Приватный метод для выполнения HTTP запроса c retry.
+
+        Запрос выполняется от пользователя user, если он передан, см.
+        BaseHttpClient._as_user. Вместо пользователя можно передать объект
+        httpx.Auth для одного запроса через kwargs["auth"].
+
+        Returns:
+            Ответ от сервера в виде httpx.Response.
+        """
+        client = self._setup_client()
+        request_headers, request_kwargs = self._encode_json(headers, json, kwargs)
+
+        async def do_request() -> httpx.Response:
+            return await client.request(
+                method=method, url=url, headers=request_headers, params=params, **request_kwargs
+            )
+
+        with self._as_user(user):
+            return await (retry(do_request)() if retry else do_request())
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        retry: AsyncRetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[httpx.Response]:
+        """Выполнить запрос с потоковым чтением тела ответа.
+
+        Асинхронный аналог HttpClient.stream: тело читают внутри блока
+        async with через aiter_bytes, aiter_lines и т.д.
+
+        Args:
+            method: HTTP метод
+            url: URL запроса относительно base_url
+            headers: Заголовки запроса
+            params: Параметры строки запроса
+            json: Тело запроса в формате JSON
+            retry: Retry декоратор для отправки запроса
+            user: Пара (логин, пароль) пользователя BearerTokenAuth для запроса
+            **kwargs: Дополнительные параметры, как у httpx.AsyncClient.request
+
+        Yields:
+            Ответ с непрочитанным телом; закрывается при выходе из блока.
+        """
+        client = self._setup_client()
+        request_headers, request_kwargs = self._encode_json(headers, json, kwargs)
+        build_kwargs, send_kwargs = self._split_send_kwargs(request_kwargs)
+        responses: list[httpx.Response] = []
+
+        async def do_request() -> httpx.Response:
+            while responses:
+                await responses.pop().aclose()
+
+            request = client.build_request(
+                method=method, url=url, headers=request_headers, params=params, **build_kwargs
+            )
+            response = await client.send(request, stream=True, **send_kwargs)
+            responses.append(response)
+            return response
+
+        try:
+            with self._as_user(user):
+                response = await (retry(do_request)() if retry else do_request())
+            yield response
+        finally:
+            while responses:
+                await responses.pop().aclose()
+
+    async def get(
+        self,
+        url: str,
+        headers: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        retry: AsyncRetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Выполнить GET запрос.
+
+        Returns:
+            Ответ от сервера в виде httpx.Response.
+        """
+        return await self._send(
+            method="GET", url=url, headers=headers, params=params, json=json, retry=retry, user=user, **kwargs
+        )
+
+    async def post(
+        self,
+        url: str,
+        headers: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        retry: AsyncRetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Выполнить POST запрос.
+
+        Returns:
+            Ответ от сервера в виде httpx.Response.
+        """
+        return await self._send(
+            method="POST", url=url, headers=headers, params=params, json=json, retry=retry, user=user, **kwargs
+        )
+
+    async def put(
+        self,
+        url: str,
+        headers: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        retry: AsyncRetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Выполнить PUT запрос.
+
+        Returns:
+            Ответ от сервера в виде httpx.Response.
+        """
+        return await self._send(
+            method="PUT", url=url, headers=headers, params=params, json=json, retry=retry, user=user, **kwargs
+        )
+
+    async def patch(
+        self,
+        url: str,
+        headers: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        retry: AsyncRetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Выполнить PATCH запрос.
+
+        Returns:
+            Ответ от сервера в виде httpx.Response.
+        """
+        return await self._send(
+            method="PATCH", url=url, headers=headers, params=params, json=json, retry=retry, user=user, **kwargs
+        )
+
+    async def delete(
+        self,
+        url: str,
+        headers: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        retry: AsyncRetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Выполнить DELETE запрос.
+
+        Returns:
+            Ответ от сервера в виде httpx.Response.
+        """
+        return await self._send(
+            method="DELETE", url=url, headers=headers, params=params, json=json, retry=retry, user=user, **kwargs
+        )
@@ -1,9 +1,28 @@
-from collections.abc import Generator
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from collections.abc import AsyncGenerator, Generator, Iterable
 from contextlib import contextmanager
-from typing import ClassVar
+from contextvars import ContextVar
+from dataclasses import replace
+from threading import Event, Lock, Thread
+from typing import TYPE_CHECKING, Any, ClassVar, TypeGuard
 
 import httpx
 
+from .keyed_lock import KeyedLock
+from .token_cache import CachedToken, MemoryTokenStore, TokenCacheStats, TokenStore
+
+if TYPE_CHECKING:
+    from ..client import RetryDecorator
+
+logger = logging.getLogger(__name__)
+
+# Пользователи, активные в текущем потоке или задаче, по id(BearerTokenAuth)
+_context_users: ContextVar[dict[int, tuple[str, str]] | None] = ContextVar("bearer_token_auth_users", default=None)
+
 
 class BearerTokenAuth(httpx.Auth):
     """OAuth 2.0 Bearer Token аутентификация для httpx с кешированием токенов.
@@ -14,20 +33,41 @@ class BearerTokenAuth(httpx.Auth):
 
     Основные возможности:
         - Автоматическое получение access token при первом запросе
-        - Кеширование токенов по хешу пользователя
+        - Кеширование токенов по хешу стенда и пользователя с учетом expires_in,
+          ограничение размера кеша (LRU) и времени хранения (TTL)
+        - Обновление токена заранее, за refresh_skew секунд до истечения
+        - Один запрос токена на пользователя при одновременных обращениях из потоков
+        - Обновление токена через refresh_token без повторного ввода пароля
+        - Параллельное получение токенов для списка пользователей заранее (prewarm)
+        - Время жизни из claim exp JWT, если сервер не сообщает expires_in
+        - Режим client credentials с одним сервисным токеном на процесс
+        - Фоновое обновление токенов до истечения (start_refresher)
+        - Общее для процессов хранилище токенов (SqliteTokenStore) для pytest-xdist
+        - Постоянный пул соединений к token_url с собственными таймаутом, retry и TLS
         - Добавление Bearer токена в заголовки всех запросов
-        - Возможность смены пользователя без пересоздания объекта
-        - Интеграция с httpx через протокол Auth
+        - Возможность смены пользователя без пересоздания объекта, независимо
+          для каждого потока и asyncio задачи
+        - Интеграция с httpx через протокол Auth, в AsyncHttpClient запрос
+          токена не блокирует цикл событий
 
     Атрибуты:
         token_url: URL эндпоинта для получения токена
         client_id: Идентификатор клиента для аутентификации
         client_secret: Секрет клиента для аутентификации
-        username: Имя пользователя
-        password: Пароль пользователя
+        username: Имя активного в текущем контексте пользователя
+        password: Пароль активного в текущем контексте пользователя
         scope: Список разрешений (scope) через пробел
         response_type: Тип ответа OAuth
         grant_type: Тип grant OAuth 2.0
+        refresh_skew: Запас в секундах до истечения токена, после которого он обновляется
+        use_refresh_token: Флаг обновления токена через grant_type=refresh_token
+        decode_jwt_exp: Флаг чтения времени истечения из claim exp JWT
+        reauth_on_401: Флаг повторного входа и повтора запроса после ответа 401
+        token_timeout: Таймаут запроса токена в секундах
+        verify: Флаг проверки SSL сертификата token_url
+        retries: Число повторных попыток установить соединение с token_url
+        retry: Retry декоратор (tenacity) для запроса токена
+        token_store: Хранилище токенов, по умолчанию общее для всех экземпляров в процессе
         _current_user_key_hash: Хеш-ключ текущего пользователя
 
     Пример использования:
@@ -44,9 +84,14 @@ class BearerTokenAuth(httpx.Auth):
         >>> client = httpx.Client(auth=auth)
     """
 
-    _token_cache: ClassVar[dict[tuple[str, str], str]] = {}
+    CLIENT_CREDENTIALS: ClassVar[str] = "client_credentials"
 
-    def __init__(
+    _token_cache: ClassVar[MemoryTokenStore] = MemoryTokenStore()
+    _fetch_locks: ClassVar[KeyedLock] = KeyedLock()
+    _stats_lock: ClassVar[Lock] = Lock()
+    _coalesced_fetches: ClassVar[int] = 0
+
+    def __init__(  # noqa: PLR0913
         self,
         token_url: str,
         client_id: str,
@@ -56,30 +101,298 @@ class BearerTokenAuth(httpx.Auth):
         scope: str,
         response_type: str,
         grant_type: str,
+        *,
+        refresh_skew: float = 30.0,
+        use_refresh_token: bool = True,
+        decode_jwt_exp: bool = False,
+        reauth_on_401: bool = True,
+        token_timeout: float = 10.0,
+        verify: bool = False,
+        retries: int = 0,
+        retry: RetryDecorator | None = None,
+        transport: httpx.BaseTransport | None = None,
+        token_store: TokenStore | None = None,
     ) -> None:
-        """Инициализирует аутентификацию Bearer Token."""
+        """Инициализирует аутентификацию Bearer Token.
+
+        Args:
+            token_url: URL эндпоинта для получения токена
+            client_id: Идентификатор клиента для аутентификации
+            client_secret: Секрет клиента для аутентификации
+            username: Имя пользователя
+            password: Пароль пользователя
+            scope: Список разрешений (scope) через пробел
+            response_type: Тип ответа OAuth
+            grant_type: Тип grant OAuth 2.0
+            refresh_skew: Запас в секундах до истечения токена, после которого он обновляется
+            use_refresh_token: Обновлять токен через grant_type=refresh_token, если сервер
+                выдал refresh_token. При отказе сервера выполняется вход по паролю
+            decode_jwt_exp: Если сервер не сообщает expires_in, брать время истечения
+                из claim exp токена в формате JWT (без проверки подписи)
+            reauth_on_401: При ответе 401 запрашивать новый токен и повторять запрос
+                один раз. Отключите, если 401 - ожидаемый результат теста (проверка
+                прав доступа): иначе каждый такой запрос выполняет лишний вход и повтор
+            token_timeout: Таймаут запроса токена в секундах
+            verify: Флаг проверки SSL сертификата token_url
+            retries: Число повторных попыток установить соединение с token_url.
+                Не используется, если передан transport
+            retry: Retry декоратор (tenacity) для запроса токена
+            transport: Транспорт httpx для запросов токена. Позволяет использовать
+                тот же пул соединений, что и у HttpClient(transport=...)
+            token_store: Хранилище токенов. По умолчанию используется общий для процесса
+                кеш в памяти, SqliteTokenStore делит токены между процессами машины
+        """
         self.token_url = token_url
         self.client_id = client_id
         self.client_secret = client_secret
-        self.username = username
-        self.password = password
         self.scope = scope
         self.response_type = response_type
         self.grant_type = grant_type
+        self.refresh_skew = refresh_skew
+        self.use_refresh_token = use_refresh_token
+        self.decode_jwt_exp = decode_jwt_exp
+        self.reauth_on_401 = reauth_on_401
+        self.token_timeout = token_timeout
+        self.verify = verify
+        self.retries = retries
+        self.retry = retry
+        self.token_store = token_store or self._token_cache
+
+        self._transport = transport
+        self._token_client: httpx.Client | None = None
+        self._token_client_lock = Lock()
+
+        self._known_users: dict[str, tuple[str, str]] = {}
+        self._refresher: Thread | None = None
+        self._refresher_stop = Event()
 
         self._admin_user = username, password
-        self._current_user_key = self._admin_user
 
-    def _fetch_token(self) -> str:
+    @classmethod
+    def client_credentials(
+        cls,
+        token_url: str,
+        client_id: str,
+        client_secret: str,
+        scope: str = "",
+        **kwargs: Any,
+    ) -> BearerTokenAuth:
+        """Создает аутентификацию по данным клиента (grant_type=client_credentials).
+
+        Сервисный токен не привязан к пользователю, поэтому ключ кеша зависит
+        только от token_url, client_id и scope: токен запрашивается один раз и
+        используется всеми экземплярами и HttpClient процесса до истечения.
+
+        Args:
+            token_url: URL эндпоинта для получения токена
+            client_id: Идентификатор клиента для аутентификации
+            client_secret: Секрет клиента для аутентификации
+            scope: Список разрешений (scope) через пробел
+            **kwargs: Дополнительные параметры BearerTokenAuth (refresh_skew, token_store и т.д.)
+
+        Returns:
+            Объект аутентификации для межсервисных запросов.
+
+        Example:
+            >>> auth = BearerTokenAuth.client_credentials(
+            ...     token_url="https://api.example.com/token",
+            ...     client_id="service",
+            ...     client_secret="secret",
+            ... )
+        """
+        return cls(
+            token_url=token_url,
+            client_id=client_id,
+            client_secret=client_secret,
+            username="",
+            password="",
+            scope=scope,
+            response_type="token",
+            grant_type=cls.CLIENT_CREDENTIALS,
+            **kwargs,
+        )
+
+    @property
+    def _current_user_key(self) -> tuple[str, str]:
+        """Логин и пароль пользователя, активного в текущем контексте."""
+        users = _context_users.get()
+        return (users and users.get(id(self))) or self._admin_user
+
+    @property
+    def username(self) -> str:
+        """Имя пользователя, активного в текущем контексте."""
+        return self._current_user_key[0]
+
+    @property
+    def password(self) -> str:
+        """Пароль пользователя, активного в текущем контексте."""
+        return self._current_user_key[1]
+
+    def _fetch_token(self, stale_token: str | None = None) -> str:
         """Получает access token с кешированием.
 
+        Токен из кеша используется, пока он действителен с учетом refresh_skew,
+        иначе запрашивается новый. Одновременные промахи кеша по одному ключу
+        объединяются: запрос к token_url выполняет первый поток, остальные
+        ждут его результат.
+
+        Args:
+            stale_token: Токен, отклоненный сервером. Если он все еще в кеше,
+                запрашивается новый, а если другой поток уже обновил токен,
+                используется обновленный.
+
         Returns:
             Access token в виде строки.
         """
-        if self._current_user_key in self._token_cache:
-            return self._token_cache[self._current_user_key]
+        key = self._cache_key()
+        cached = self.token_store.get(key)
+        if self._is_usable(cached, stale_token):
+            return cached.access_token
+
+        return self._fetch_token_locked(key, stale_token)
+
+    async def _async_fetch_token(self, stale_token: str | None = None) -> str:
+        """Получает access token, не блокируя цикл событий.
+
+        Токен из кеша возвращается сразу, а запрос к token_url выполняется в
+        потоке через anyio.to_thread.run_sync, поэтому работает и с asyncio,
+        и с trio. Поток наследует контекст задачи, в
+        том числе пользователя из switch_to_user, поэтому логины разных
+        пользователей идут параллельно, а одновременные промахи по одному
+        ключу объединяются, как в _fetch_token.
+
+        Args:
+            stale_token: Токен, отклоненный сервером, см. _fetch_token
+
+        Returns:
+            Access token в виде строки.
+        """
+        key = self._cache_key()
+        cached = self.token_store.get(key)
+        if self._is_usable(cached, stale_token):
+            return cached.access_token
+
+        import anyio.to_thread  # noqa: PLC0415
+
+        return await anyio.to_thread.run_sync(self._fetch_token_locked, key, stale_token)
+
+    def _fetch_token_locked(self, key: str, stale_token: str | None) -> str:
+        """Запрашивает токен под блокировкой ключа, если его не обновил другой поток.
+
+        Args:
+            key: Ключ кеша текущего пользователя
+            stale_token: Токен, отклоненный сервером, см. _fetch_token
+
+        Returns:
+            Access token в виде строки.
+        """
+        with self._fetch_locks.acquire(key), self.token_store.lock(key):
+            cached = self.token_store.peek(key)
+            if self._is_usable(cached, stale_token):
+                with self._stats_lock:
+                    BearerTokenAuth._coalesced_fetches += 1
+                return cached.access_token
+
+            token = self._renew_token(cached)
+            self.token_store.set(key, token)
+            self._known_users[key] = self._current_user_key
+            return token.access_token
+
+    def _cache_key(self) -> str:
+        """Возвращает ключ кеша для текущего пользователя.
+
+        Ключ - хеш адреса token_url, клиента, scope и данных пользователя, поэтому
+        токены разных стендов не смешиваются в общем хранилище, а пароль в него
+        не попадает.
+
+        Returns:
+            Хеш-ключ текущего пользователя.
+        """
+        username, password = self._current_user_key
+        parts = (self.token_url, self.client_id, self.scope, username, password)
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def _is_usable(self, cached: CachedToken | None, stale_token: str | None) -> TypeGuard[CachedToken]:
+        """Проверяет, можно ли отправить токен из кеша.
+
+        Returns:
+            True, если токен есть в кеше, не отклонен сервером и не истекает.
+        """
+        return cached is not None and cached.access_token != stale_token and cached.is_valid(self.refresh_skew)
+
+    def cache_stats(self) -> TokenCacheStats:
+        """Статистика хранилища токенов этого объекта.
+
+        Каждое получение токена учитывается один раз: как попадание, если
+        токен взят из хранилища, или как промах, если его пришлось запросить.
+        Хранилище по умолчанию общее для процесса, поэтому в статистику
+        попадают и обращения других экземпляров.
+
+        Returns:
+            Счетчики попаданий, промахов и вытеснений хранилища.
+        """
+        return self.token_store.stats()
+
+    @classmethod
+    def coalesced_fetches(cls) -> int:
+        """Число запросов токена, сэкономленных за счет объединения одновременных промахов кеша.
+
+        Returns:
+            Количество обращений, получивших токен, запрошенный другим потоком.
+        """
+        return cls._coalesced_fetches
+
+    def _renew_token(self, cached: CachedToken | None) -> CachedToken:
+        """Получает новый токен взамен отсутствующего или устаревшего.
+
+        Если у записи кеша есть действующий refresh_token, сначала выполняется
+        дешевый grant_type=refresh_token. Вход по паролю выполняется, только
+        если токена обновления нет или сервер его отклонил (400 или 401).
+
+        Args:
+            cached: Текущая запись кеша для пользователя
+
+        Returns:
+            Запись кеша с новым токеном.
+
+        Raises:
+            httpx.HTTPStatusError: Если сервер вернул ошибку, не связанную с отказом в refresh_token.
+        """
+        if self.use_refresh_token and cached is not None and cached.refresh_token and cached.can_refresh():
+            try:
+                token = self._request_token(self._refresh_grant_data(cached.refresh_token))
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in {httpx.codes.BAD_REQUEST, httpx.codes.UNAUTHORIZED}:
+                    raise
+            else:
+                if token.refresh_token is None:
+                    token = replace(
+                        token, refresh_token=cached.refresh_token, refresh_expires_at=cached.refresh_expires_at
+                    )
+                return token
 
-        data = {
+        return self._request_token(self._grant_data())
+
+    def _grant_data(self) -> dict[str, str]:
+        """Формирует тело запроса токена по логину и паролю или по данным клиента.
+
+        Для client credentials пустой scope не передается: параметр
+        необязателен, а часть серверов отклоняет пустое значение.
+
+        Returns:
+            Поля формы для token_url.
+        """
+        if self.grant_type == self.CLIENT_CREDENTIALS:
+            data = {
+                "grant_type": self.grant_type,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+            }
+            if self.scope:
+                data["scope"] = self.scope
+            return data
+
+        return {
             "grant_type": self.grant_type,
             "client_id": self.client_id,
             "client_secret": self.client_secret,
@@ -89,19 +402,139 @@ class BearerTokenAuth(httpx.Auth):
             "response_type": self.response_type,
         }
 
-        response = httpx.post(
-            self.token_url,
-            data=data,
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-            verify=False,  # noqa: S501
-        )
-        response.raise_for_status()
+    def _refresh_grant_data(self, refresh_token: str) -> dict[str, str]:
+        """Формирует тело запроса обновления токена.
+
+        Returns:
+            Поля формы для token_url.
+        """
+        return {
+            "grant_type": "refresh_token",
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "refresh_token": refresh_token,
+            "scope": self.scope,
+        }
+
+    def _request_token(self, data: dict[str, str]) -> CachedToken:
+        """Запрашивает новый токен у эндпоинта token_url.
+
+        Args:
+            data: Поля формы запроса токена
+
+        Returns:
+            Запись кеша с токеном и временем его истечения.
+        """
+        client = self._setup_token_client()
+
+        def do_request() -> httpx.Response:
+            response = client.post(
+                self.token_url,
+                data=data,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+            response.raise_for_status()
+            return response
+
+        response = self.retry(do_request)() if self.retry else do_request()
+        return CachedToken.from_token_response(response.json(), decode_jwt_exp=self.decode_jwt_exp)
+
+    def _setup_token_client(self) -> httpx.Client:
+        """Создает клиент httpx для запросов токена, если он еще не создан.
+
+        Клиент переиспользуется всеми запросами токена этого объекта, поэтому
+        соединение и TLS сессия к token_url устанавливаются один раз.
+
+        Returns:
+            Экземпляр httpx.Client для запросов к token_url.
+        """
+        with self._token_client_lock:
+            if self._token_client is None:
+                transport = self._transport or httpx.HTTPTransport(verify=self.verify, retries=self.retries)
+                self._token_client = httpx.Client(timeout=self.token_timeout, verify=self.verify, transport=transport)
+
+            return self._token_client
+
+    def refresh_expiring(self, refresh_ahead: float = 60.0) -> int:
+        """Обновить токены пользователей, которые скоро истекут.
+
+        Обновляются токены, полученные этим объектом, у которых до истечения
+        осталось меньше refresh_skew + refresh_ahead секунд. Пока идет
+        обновление, запросы продолжают использовать текущий токен и не ждут.
+        Пользователи, чьи записи вытеснены из кеша, перестают отслеживаться.
+
+        Args:
+            refresh_ahead: Дополнительный запас в секундах к refresh_skew
+
+        Returns:
+            Число обновленных токенов.
+        """
+        refreshed = 0
+        now = time.time()
+        for key, user in list(self._known_users.items()):
+            cached = self.token_store.peek(key)
+            if cached is None:
+                self._known_users.pop(key, None)
+                continue
+
+            if cached.is_valid(self.refresh_skew + refresh_ahead, now=now):
+                continue
+
+            with self.switch_to_user(*user):
+                self._fetch_token_locked(key, stale_token=cached.access_token)
+            refreshed += 1
 
-        token_data = response.json()
-        token: str = token_data["access_token"]
+        return refreshed
 
-        self._token_cache[self._current_user_key] = token
-        return token
+    def start_refresher(self, interval: float = 5.0, refresh_ahead: float = 60.0) -> None:
+        """Запустить фоновый поток, обновляющий токены до их истечения.
+
+        Поток раз в interval секунд вызывает refresh_expiring, поэтому потоки
+        запросов не ждут запроса токена, а медленный сервер авторизации не
+        добавляет задержку к запросам API. Ошибки обновления логируются,
+        поток продолжает работу. Повторный вызов ничего не делает.
+
+        Args:
+            interval: Интервал проверки токенов в секундах
+            refresh_ahead: Дополнительный запас в секундах к refresh_skew
+
+        Example:
+            >>> auth.start_refresher(interval=10, refresh_ahead=120)
+            >>> ...  # Длительный нагрузочный прогон
+            >>> auth.stop_refresher()
+        """
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+
+        def run() -> None:
+            while not self._refresher_stop.wait(interval):
+                try:
+                    self.refresh_expiring(refresh_ahead)
+                except Exception:
+                    logger.exception("Не удалось обновить токены в фоне")
+
+        self._refresher_stop.clear()
+        self._refresher = Thread(target=run, name="bearer-token-refresher", daemon=True)
+        self._refresher.start()
+
+    def stop_refresher(self) -> None:
+        """Остановить фоновый поток обновления токенов."""
+        if self._refresher is not None:
+            self._refresher_stop.set()
+            self._refresher.join()
+            self._refresher = None
+
+    def close(self) -> None:
+        """Закрытие клиента httpx для запросов токена и фонового обновления.
+
+        Переданный извне transport не закрывается: им владеет вызывающий код.
+        """
+        self.stop_refresher()
+        with self._token_client_lock:
+            if self._token_client is not None:
+                if self._transport is None:
+                    self._token_client.close()
+                self._token_client = None
 
     def auth_flow(self, request: httpx.Request) -> Generator[httpx.Request, httpx.Response]:
         """Реализует поток аутентификации httpx.
@@ -110,6 +543,10 @@ class BearerTokenAuth(httpx.Auth):
         (из кеша или запросом к серверу) и добавляет его в заголовки
         запроса в формате "Bearer {token}".
 
+        Если сервер ответил 401, токен считается отозванным или истекшим:
+        он вытесняется из кеша, запрашивается новый и запрос повторяется
+        один раз. С reauth_on_401=False ответ 401 возвращается как есть.
+
         Args:
             request: Объект запроса httpx
 
@@ -122,19 +559,69 @@ class BearerTokenAuth(httpx.Auth):
         """
         token = self._fetch_token()
         request.headers["Authorization"] = f"Bearer {token}"
-        yield request
+        response = yield request
+
+        if self.reauth_on_401 and response.status_code == httpx.codes.UNAUTHORIZED:
+            token = self._fetch_token(stale_token=token)
+            request.headers["Authorization"] = f"Bearer {token}"
+            yield request
+
+    async def async_auth_flow(self, request: httpx.Request) -> AsyncGenerator[httpx.Request, httpx.Response]:
+        """Реализует асинхронный поток аутентификации httpx.
 
-    def _update_user(self, username: str, password: str) -> None:
-        """Обновить пользователя."""
-        self.username = username
-        self.password = password
-        self._current_user_key = (self.username, self.password)
+        Работает как auth_flow, но запрос токена выполняется в отдельном
+        потоке, поэтому логин не блокирует цикл событий AsyncHttpClient.
+
+        Args:
+            request: Объект запроса httpx
+
+        Yields:
+            Модифицированный объект запроса с заголовком Authorization
+        """
+        token = await self._async_fetch_token()
+        request.headers["Authorization"] = f"Bearer {token}"
+        response = yield request
+
+        if self.reauth_on_401 and response.status_code == httpx.codes.UNAUTHORIZED:
+            token = await self._async_fetch_token(stale_token=token)
+            request.headers["Authorization"] = f"Bearer {token}"
+            yield request
+
+    def prewarm(self, users: Iterable[tuple[str, str]], max_workers: int = 8) -> None:
+        """Получить токены для списка пользователей заранее.
+
+        Токены запрашиваются параллельно, не более max_workers одновременно,
+        и сохраняются в кеш. Первый запрос каждого пользователя в тесте затем
+        берет токен из кеша, а логин не попадает в измеряемый участок.
+
+        Args:
+            users: Пары (логин, пароль)
+            max_workers: Максимальное число одновременных запросов токена
+
+        Example:
+            >>> auth.prewarm([("user1", "pass1"), ("user2", "pass2")], max_workers=16)
+        """
+
+        def warm(user: tuple[str, str]) -> None:
+            with self.switch_to_user(*user):
+                self._fetch_token()
+
+        from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="token-prewarm") as executor:
+            for _ in executor.map(warm, users):
+                pass
 
     @contextmanager
     def switch_to_user(self, username: str, password: str) -> Generator[None]:
         """Временно переключиться на другого пользователя.
 
-        При выходе из контекстного менеджера переключается на пользователя-администратора.
+        Пользователь хранится в contextvar, поэтому переключение действует только
+        в текущем потоке или asyncio задаче: несколько потоков могут одновременно
+        работать от разных пользователей через один HttpClient и общий пул
+        соединений. Задачи asyncio, созданные внутри блока, наследуют пользователя.
+        При выходе из контекстного менеджера восстанавливается предыдущий
+        пользователь (по умолчанию пользователь-администратор).
 
         Example:
             >>> auth = BearerTokenAuth(...)
@@ -142,13 +629,8 @@ class BearerTokenAuth(httpx.Auth):
             ...     client.get("/api")  # Запрос от user1
             >>> # Автоматически вернулся к admin
         """
-        self._update_user(username=username, password=password)
-        yield
-        self._switch_to_admin()
-
-    def _switch_to_admin(self) -> None:
-        """Переключиться на пользователя-администратора.
-
-        Администратором считаем пользователя, под которым инициализируется класс.
-        """
-        self._update_user(*self._admin_user)
+        token = _context_users.set({**(_context_users.get() or {}), id(self): (username, password)})
+        try:
+            yield
+        finally:
+            _context_users.reset(token)
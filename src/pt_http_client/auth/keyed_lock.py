@@ -0,0 +1,40 @@
+from collections.abc import Generator, Hashable
+from contextlib import contextmanager
+from threading import Lock
+
+
+class KeyedLock:
+    """Набор блокировок по ключу для потоков.
+
+    Блокировка создается при первом обращении к ключу и удаляется, когда
+    ее больше никто не ждет, поэтому число блокировок не растет вместе
+    с числом ключей.
+
+    Пример:
+        >>> locks = KeyedLock()
+        >>> with locks.acquire(("user", "password")):
+        ...     ...  # Только один поток выполняет код для этого ключа
+    """
+
+    def __init__(self) -> None:
+        """Инициализирует пустой набор блокировок."""
+        self._guard = Lock()
+        self._locks: dict[Hashable, tuple[Lock, int]] = {}
+
+    @contextmanager
+    def acquire(self, key: Hashable) -> Generator[None]:
+        """Захватить блокировку ключа на время блока with."""
+        with self._guard:
+            lock, waiters = self._locks.get(key, (Lock(), 0))
+            self._locks[key] = lock, waiters + 1
+
+        try:
+            with lock:
+                yield
+        finally:
+            with self._guard:
+                lock, waiters = self._locks[key]
+                if waiters == 1:
+                    del self._locks[key]
+                else:
+                    self._locks[key] = lock, waiters - 1
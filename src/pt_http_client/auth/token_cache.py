@@ -0,0 +1,537 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import os
+import stat
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+@dataclass(frozen=True, slots=True)
+class CachedToken:
+    """Токен доступа в кеше вместе со временем жизни.
+
+    Время хранится как unix timestamp, чтобы запись оставалась корректной
+    при передаче между процессами.
+
+    Атрибуты:
+        access_token: Токен доступа
+        issued_at: Время получения токена
+        expires_at: Время истечения токена или None, если сервер не сообщил expires_in
+        refresh_token: Токен обновления, если сервер его выдал
+        refresh_expires_at: Время истечения токена обновления или None, если оно неизвестно
+    """
+
+    access_token: str
+    issued_at: float
+    expires_at: float | None = None
+    refresh_token: str | None = None
+    refresh_expires_at: float | None = None
+
+    @classmethod
+    def from_token_response(
+        cls, token_data: dict[str, Any], now: float | None = None, decode_jwt_exp: bool = False
+    ) -> CachedToken:
+        """Создает запись кеша из ответа эндпоинта токена.
+
+        Args:
+            token_data: Тело ответа эндпоинта токена
+            now: Текущее время, по умолчанию time.time()
+            decode_jwt_exp: Если сервер не сообщил expires_in (refresh_expires_in),
+                брать время истечения из claim exp токена, если он является JWT
+
+        Returns:
+            Запись кеша с рассчитанным временем истечения.
+        """
+        issued_at = time.time() if now is None else now
+        access_token: str = token_data["access_token"]
+        refresh_token: str | None = token_data.get("refresh_token")
+        expires_in = token_data.get("expires_in")
+        refresh_expires_in = token_data.get("refresh_expires_in")
+
+        expires_at = issued_at + float(expires_in) if expires_in is not None else None
+        refresh_expires_at = issued_at + float(refresh_expires_in) if refresh_expires_in else None
+        if decode_jwt_exp:
+            expires_at = expires_at if expires_at is not None else jwt_expiry(access_token)
+            if refresh_token is not None and refresh_expires_at is None:
+                refresh_expires_at = jwt_expiry(refresh_token)
+
+        return cls(
+            access_token=access_token,
+            issued_at=issued_at,
+            expires_at=expires_at,
+            refresh_token=refresh_token,
+            refresh_expires_at=refresh_expires_at,
+        )
+
+    def is_valid(self, skew: float = 0.0, now: float | None = None) -> bool:
+        """Проверяет, можно ли еще использовать токен.
+
+        Токен считается устаревшим за skew секунд до истечения, чтобы он не
+        истек в полете. Для короткоживущих токенов запас ограничен половиной
+        времени жизни, иначе токен обновлялся бы на каждый запрос.
+
+        Args:
+            skew: Запас в секундах до истечения токена
+            now: Текущее время, по умолчанию time.time()
+
+        Returns:
+            True, если токен действителен с учетом запаса.
+        """
+        if self.expires_at is None:
+            return True
+
+        now = time.time() if now is None else now
+        skew = min(skew, (self.expires_at - self.issued_at) / 2)
+        return now < self.expires_at - skew
+
+    def can_refresh(self, now: float | None = None) -> bool:
+        """Проверяет, можно ли обновить токен через grant_type=refresh_token.
+
+        Args:
+            now: Текущее время, по умолчанию time.time()
+
+        Returns:
+            True, если есть токен обновления и он еще не истек.
+        """
+        if self.refresh_token is None:
+            return False
+
+        now = time.time() if now is None else now
+        return self.refresh_expires_at is None or now < self.refresh_expires_at
+
+    def is_alive(self, now: float | None = None) -> bool:
+        """Проверяет, есть ли смысл хранить запись.
+
+        Args:
+            now: Текущее время, по умолчанию time.time()
+
+        Returns:
+            True, если токен доступа еще действует или его можно обновить.
+        """
+        return self.is_valid(now=now) or self.can_refresh(now=now)
+
+
+_JWT_PARTS = 3
+
+
+def jwt_expiry(token: str) -> float | None:
+    """Возвращает время истечения JWT из claim exp.
+
+    Подпись токена не проверяется: время нужно только для управления кешем,
+    а подлинность токена проверяет сервер.
+
+    Args:
+        token: Токен в формате JWT (header.payload.signature)
+
+    Returns:
+        Значение exp как unix timestamp или None, если токен не JWT или claim отсутствует.
+    """
+    parts = token.split(".")
+    if len(parts) != _JWT_PARTS:
+        return None
+
+    payload = parts[1]
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    return float(exp) if isinstance(exp, int | float) and not isinstance(exp, bool) else None
+
+
+@dataclass(frozen=True, slots=True)
+class TokenCacheStats:
+    """Статистика кеша токенов.
+
+    Атрибуты:
+        hits: Число обращений, нашедших запись в кеше
+        misses: Число обращений, не нашедших запись
+        evictions: Число записей, вытесненных по размеру, TTL или истечению токена
+        size: Текущее число записей
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+
+class TokenStore(ABC):
+    """Хранилище токенов BearerTokenAuth.
+
+    Ключи хранилища - хеши данных пользователя (см. BearerTokenAuth), поэтому
+    пароли в хранилище не попадают.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> CachedToken | None:
+        """Возвращает токен по ключу или None, если его нет."""
+
+    def peek(self, key: str) -> CachedToken | None:
+        """Возвращает токен по ключу, не учитывая обращение в статистике.
+
+        Используется для повторных проверок одного и того же обращения, чтобы
+        один запрос токена учитывался в stats один раз. По умолчанию - get.
+
+        Returns:
+            Запись кеша или None.
+        """
+        return self.get(key)
+
+    @abstractmethod
+    def set(self, key: str, token: CachedToken) -> None:
+        """Сохраняет токен по ключу."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Удаляет токен по ключу."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Удаляет все токены."""
+
+    def stats(self) -> TokenCacheStats:
+        """Возвращает статистику хранилища.
+
+        Returns:
+            Снимок счетчиков. По умолчанию хранилище статистику не ведет.
+        """
+        return TokenCacheStats()
+
+    @contextmanager
+    def lock(self, key: str) -> Generator[None]:
+        """Межпроцессная блокировка ключа на время запроса токена.
+
+        Потоки одного процесса BearerTokenAuth синхронизирует сам, поэтому
+        хранилищам, доступным только текущему процессу, блокировка не нужна.
+        """
+        yield
+
+
+class MemoryTokenStore(TokenStore):
+    """Ограниченное хранилище токенов в памяти процесса с вытеснением LRU и TTL.
+
+    Когда записей становится больше max_size, вытесняется давно не
+    использованная. Запись удаляется при обращении, если она хранится
+    дольше ttl или если истек и токен доступа, и токен обновления.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float | None = None) -> None:
+        """Инициализирует пустое хранилище.
+
+        Args:
+            max_size: Максимальное число записей
+            ttl: Максимальное время хранения записи в секундах, None - без ограничения
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tokens: OrderedDict[str, tuple[CachedToken, float]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> CachedToken | None:
+        """Возвращает токен по ключу или None, если его нет.
+
+        Returns:
+            Запись кеша или None.
+        """
+        with self._lock:
+            token = self._lookup(key)
+            if token is None:
+                self._misses += 1
+                return None
+
+            self._tokens.move_to_end(key)
+            self._hits += 1
+            return token
+
+    def peek(self, key: str) -> CachedToken | None:
+        """Возвращает токен по ключу, не учитывая обращение в попаданиях и промахах.
+
+        Returns:
+            Запись кеша или None.
+        """
+        with self._lock:
+            return self._lookup(key)
+
+    def _lookup(self, key: str) -> CachedToken | None:
+        """Находит запись, вытесняя ее, если она устарела. Вызывается под блокировкой.
+
+        Returns:
+            Запись кеша или None.
+        """
+        entry = self._tokens.get(key)
+        if entry is None:
+            return None
+
+        token, stored_at = entry
+        now = time.time()
+        if (self.ttl is not None and now - stored_at >= self.ttl) or not token.is_alive(now):
+            del self._tokens[key]
+            self._evictions += 1
+            return None
+
+        return token
+
+    def set(self, key: str, token: CachedToken) -> None:
+        """Сохраняет токен по ключу, вытесняя давно не использованные записи."""
+        with self._lock:
+            self._tokens[key] = token, time.time()
+            self._tokens.move_to_end(key)
+            while len(self._tokens) > self.max_size:
+                self._tokens.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key: str) -> None:
+        """Удаляет токен по ключу."""
+        with self._lock:
+            self._tokens.pop(key, None)
+
+    def clear(self) -> None:
+        """Удаляет все токены и сбрасывает статистику."""
+        with self._lock:
+            self._tokens.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> TokenCacheStats:
+        """Возвращает статистику кеша.
+
+        Returns:
+            Снимок счетчиков попаданий, промахов и вытеснений.
+        """
+        with self._lock:
+            return TokenCacheStats(
+                hits=self._hits, misses=self._misses, evictions=self._evictions, size=len(self._tokens)
+            )
+
+
+class SqliteTokenStore(TokenStore):
+    """Хранилище токенов в файле SQLite, общее для процессов одной машины.
+
+    Позволяет воркерам pytest-xdist использовать токены друг друга: пользователь
+    логинится один раз на машину, а не в каждом процессе. Запрос токена
+    защищен межпроцессной блокировкой (арендой строки в таблице блокировок),
+    поэтому одновременный старт воркеров тоже приводит к одному логину.
+
+    Файл создается с правами 0600 до открытия базы, поэтому SQLite создает
+    файлы журнала -wal и -shm с теми же правами. Каталог по умолчанию свой
+    у каждого пользователя и создается с правами 0700. Файл или каталог,
+    принадлежащий другому пользователю, не используется. Записи, у которых
+    истек и токен доступа, и токен обновления, удаляются при каждой записи.
+
+    Пример:
+        >>> store = SqliteTokenStore()
+        >>> auth = BearerTokenAuth(..., token_store=store)
+    """
+
+    DEFAULT_FILENAME = "pt-http-client-tokens.sqlite3"
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        lock_timeout: float = 30.0,
+        poll_interval: float = 0.05,
+    ) -> None:
+        """Инициализирует хранилище и создает таблицы.
+
+        Args:
+            path: Путь к файлу базы SQLite, по умолчанию DEFAULT_FILENAME в каталоге
+                pt-http-client-<uid> временного каталога
+            lock_timeout: Максимальное время ожидания блокировки и срок аренды
+                блокировки, после которого она считается брошенной
+            poll_interval: Интервал проверки освободившейся блокировки в секундах
+        """
+        if path is None:
+            path = self._default_directory() / self.DEFAULT_FILENAME
+
+        self.path = Path(path)
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._owner = f"{os.getpid()}:{os.urandom(16).hex()}"
+
+        self._create_private_file()
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    @staticmethod
+    def _default_directory() -> Path:
+        """Создает каталог по умолчанию, доступный только текущему пользователю.
+
+        Returns:
+            Путь к каталогу.
+        """
+        import tempfile  # noqa: PLC0415
+
+        uid = _current_uid()
+        directory = Path(tempfile.gettempdir()) / f"pt-http-client-{uid if uid is not None else 'user'}"
+        directory.mkdir(mode=0o700, exist_ok=True)
+        _check_owner(directory, os.lstat(directory))
+        directory.chmod(0o700)
+        return directory
+
+    def _create_private_file(self) -> None:
+        """Создает файл базы с правами 0600 или проверяет владельца существующего."""
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0)
+        fd = os.open(self.path, flags, 0o600)
+        try:
+            _check_owner(self.path, os.fstat(fd))
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, 0o600)
+        finally:
+            os.close(fd)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Возвращает соединение текущего потока, создавая его при необходимости.
+
+        Returns:
+            Соединение SQLite.
+        """
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            import sqlite3  # noqa: PLC0415
+
+            connection = sqlite3.connect(self.path, timeout=self.lock_timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> CachedToken | None:
+        """Возвращает токен по ключу или None, если его нет.
+
+        Returns:
+            Запись кеша или None.
+        """
+        row = (
+            self._connection()
+            .execute(
+                "SELECT access_token, issued_at, expires_at, refresh_token, refresh_expires_at"
+                " FROM tokens WHERE key = ?",
+                (key,),
+            )
+            .fetchone()
+        )
+        return CachedToken(*row) if row else None
+
+    def set(self, key: str, token: CachedToken) -> None:
+        """Сохраняет токен по ключу и удаляет полностью истекшие записи."""
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO tokens"
+                " (key, access_token, issued_at, expires_at, refresh_token, refresh_expires_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, *astuple(token)),
+            )
+            connection.execute(
+                "DELETE FROM tokens WHERE expires_at < ? AND (refresh_token IS NULL OR refresh_expires_at < ?)",
+                (now, now),
+            )
+
+    def delete(self, key: str) -> None:
+        """Удаляет токен по ключу."""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM tokens WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Удаляет все токены."""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM tokens")
+
+    def stats(self) -> TokenCacheStats:
+        """Возвращает статистику хранилища.
+
+        Попадания и промахи делятся между процессами и не учитываются.
+
+        Returns:
+            Снимок с текущим числом записей.
+        """
+        (size,) = self._connection().execute("SELECT COUNT(*) FROM tokens").fetchone()
+        return TokenCacheStats(size=size)
+
+    @contextmanager
+    def lock(self, key: str) -> Generator[None]:
+        """Межпроцессная блокировка ключа на время запроса токена.
+
+        Блокировка - строка в таблице token_locks с владельцем и сроком аренды.
+        Аренда упавшего процесса истекает через lock_timeout. Если дождаться
+        блокировки не удалось, запрос токена выполняется без нее: лишний логин
+        лучше зависшего теста.
+        """
+        deadline = time.monotonic() + self.lock_timeout
+        acquired = False
+        while not acquired and time.monotonic() < deadline:
+            now = time.time()
+            with self._connection() as connection:
+                connection.execute("DELETE FROM token_locks WHERE key = ? AND expires_at < ?", (key, now))
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO token_locks (key, owner, expires_at) VALUES (?, ?, ?)",
+                    (key, self._owner, now + self.lock_timeout),
+                )
+                acquired = cursor.rowcount == 1
+            if not acquired:
+                time.sleep(self.poll_interval)
+
+        try:
+            yield
+        finally:
+            if acquired:
+                with self._connection() as connection:
+                    connection.execute("DELETE FROM token_locks WHERE key = ? AND owner = ?", (key, self._owner))
+
+
+def _current_uid() -> int | None:
+    """Возвращает uid текущего пользователя или None на платформах без uid.
+
+    Returns:
+        uid или None.
+    """
+    return os.getuid() if hasattr(os, "getuid") else None
+
+
+def _check_owner(path: Path, info: os.stat_result) -> None:
+    """Проверяет, что файл или каталог принадлежит текущему пользователю.
+
+    Args:
+        path: Путь для сообщения об ошибке
+        info: Результат lstat или fstat пути
+
+    Raises:
+        PermissionError: Если владелец - другой пользователь или путь является ссылкой.
+    """
+    uid = _current_uid()
+    if stat.S_ISLNK(info.st_mode) or (uid is not None and info.st_uid != uid):
+        raise PermissionError(f"Хранилище токенов {path} не принадлежит текущему пользователю или является ссылкой")
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    key TEXT PRIMARY KEY,
+    access_token TEXT NOT NULL,
+    issued_at REAL NOT NULL,
+    expires_at REAL,
+    refresh_token TEXT,
+    refresh_expires_at REAL
+);
+CREATE TABLE IF NOT EXISTS token_locks (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
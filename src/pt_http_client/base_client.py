@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any, Self
+
+import httpx
+
+from .auth.bearer import BearerTokenAuth
+from .codec import _CODEC_KEY, JsonCodec, get_codec
+from .event_hooks.abstract_hook_handler import AbstractHookHandler
+from .event_hooks.profiles import DEFAULT_PROFILE, build_handlers
+
+# Параметры httpx.Client.request, которые передаются в send вместо build_request
+_SEND_KWARGS = frozenset({"auth", "follow_redirects"})
+
+
+class BaseHttpClient[ClientT: (httpx.Client, httpx.AsyncClient)](ABC):
+    """Общая часть синхронного и асинхронного HTTP клиентов.
+
+    Хранит настройки подключения и список обработчиков событий. Создание
+    клиента httpx и регистрация хуков реализуются в наследниках, так как
+    для httpx.AsyncClient хуки должны быть корутинами.
+
+    Атрибуты:
+        base_url: Базовый URL для всех запросов
+        timeout: Таймаут запроса по умолчанию в секундах
+        verify: Флаг проверки SSL сертификатов
+        auth: Объект аутентификации httpx
+        default_headers: Заголовки по умолчанию для всех запросов
+        client_kwargs: Дополнительные параметры для клиента httpx
+        codec: Кодек JSON, см. pt_http_client.codec
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 10.0,
+        verify: bool = False,
+        auth: httpx.Auth | None = None,
+        default_headers: dict[str, str] | None = None,
+        handlers: list[AbstractHookHandler] | None = None,
+        profile: str = DEFAULT_PROFILE,
+        codec: str | JsonCodec = "auto",
+        **client_kwargs: Any,
+    ) -> None:
+        """Инициализирует HTTP клиент.
+
+        Args:
+            base_url: Базовый URL для всех запросов
+                Пример: "https://api.example.com/v1"
+            timeout: Таймаут запроса по умолчанию в секундах
+            verify: Флаг проверки SSL сертификатов
+            auth: Объект аутентификации httpx (BasicAuth, BearerToken и т.д.)
+            default_headers: Заголовки по умолчанию для всех запросов
+            handlers: Обработчики запросов/ответов, см. AbstractHookHandler
+            profile: Профиль набора обработчиков, если handlers не переданы:
+                "production" - только строка статуса в лог, "test" - Allure, cURL и лог,
+                "debug" - как test, но тела ответов в логе на уровне INFO,
+                "failures" - как test, но вложения только при ошибке или падении теста.
+                См. event_hooks.profiles.register_profile
+            codec: Кодек JSON для тел запросов, разбора ответов и вложений обработчиков:
+                "auto" (orjson или msgspec, если установлены, иначе stdlib), "orjson",
+                "msgspec", "stdlib" или экземпляр JsonCodec
+            **client_kwargs: Дополнительные параметры для клиента httpx
+                См. документацию httpx: https://www.python-httpx.org/api/#client
+
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.verify = verify
+        self.auth = auth
+        self.default_headers = default_headers.copy() if default_headers else {}
+        self.client_kwargs = client_kwargs
+        self.codec = get_codec(codec)
+        self._client: ClientT | None = None
+
+        self._handlers: list[AbstractHookHandler] = handlers or build_handlers(profile)
+
+    @abstractmethod
+    def _update_client_hooks(self) -> None:
+        """Обновляет event_hooks существующего клиента."""
+
+    def add_handler(self, handler: AbstractHookHandler) -> Self:
+        """Добавляет обработчик, обновляет хуки клиента.
+
+        Args:
+            handler: Обработчик событий для добавления.
+
+        Returns:
+            Текущий экземпляр клиента (fluent interface).
+        """
+        self._handlers.append(handler)
+
+        if self._client:
+            self._update_client_hooks()
+
+        return self
+
+    def _codec_request_hook(self, request: httpx.Request) -> None:
+        """Передает кодек JSON клиента обработчикам через request.extensions."""
+        request.extensions[_CODEC_KEY] = self.codec
+
+    def _encode_json(
+        self, headers: dict[str, str] | None, json: Any, kwargs: dict[str, Any]
+    ) -> tuple[httpx.Headers | dict[str, str] | None, dict[str, Any]]:
+        """Кодирует параметр json запроса кодеком клиента.
+
+        Если вместе с json передан content, data или files, json передается
+        httpx без изменений, чтобы сохранить приоритет тел httpx: content,
+        затем files и data, и только потом json.
+
+        Args:
+            headers: Заголовки запроса
+            json: Тело запроса в формате JSON или None
+            kwargs: Дополнительные параметры запроса
+
+        Returns:
+            Заголовки с Content-Type и параметры запроса с закодированным content.
+        """
+        if json is None:
+            return headers, kwargs
+
+        if kwargs.get("content") is not None or kwargs.get("data") or kwargs.get("files"):
+            return headers, {**kwargs, "json": json}
+
+        merged = httpx.Headers(headers)
+        if "Content-Type" not in merged and (self._client is None or "Content-Type" not in self._client.headers):
+            merged["Content-Type"] = "application/json"
+
+        return merged, {**kwargs, "content": self.codec.dumps(json)}
+
+    def _close_handlers(self) -> None:
+        """Закрывает обработчики событий, например выгружает фоновые очереди."""
+        for handler in self._handlers:
+            handler.close()
+
+    @staticmethod
+    def _split_send_kwargs(kwargs: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Разделяет параметры запроса между build_request и send клиента httpx.
+
+        Args:
+            kwargs: Дополнительные параметры запроса, как у httpx.Client.request
+
+        Returns:
+            Пара (параметры build_request, параметры send).
+        """
+        build_kwargs = {key: value for key, value in kwargs.items() if key not in _SEND_KWARGS}
+        send_kwargs = {key: value for key, value in kwargs.items() if key in _SEND_KWARGS}
+        return build_kwargs, send_kwargs
+
+    def _as_user(self, user: tuple[str, str] | None) -> AbstractContextManager[None]:
+        """Контекст выполнения запроса от указанного пользователя.
+
+        Пользователь активируется через BearerTokenAuth.switch_to_user только для
+        текущего потока или задачи, а токен берется из общего кеша. Так запросы
+        разных пользователей идут через один клиент и пул соединений.
+
+        Args:
+            user: Пара (логин, пароль) или None для текущего пользователя
+
+        Returns:
+            Контекстный менеджер, активирующий пользователя.
+
+        Raises:
+            TypeError: Если пользователь передан, а аутентификация клиента не BearerTokenAuth.
+        """
+        if user is None:
+            return nullcontext()
+
+        if not isinstance(self.auth, BearerTokenAuth):
+            raise TypeError("Параметр user поддерживается только с аутентификацией BearerTokenAuth")
+
+        return self.auth.switch_to_user(*user)
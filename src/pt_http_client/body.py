@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import zlib
+from collections.abc import AsyncIterator, Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from .codec import JsonCodec, codec_for
+
+_BODY_KEY = "pt_http_client.body"
+_CAPTURE_KEY = "pt_http_client.body_capture"
+
+# Кодировки Content-Encoding, которые BodyCapture умеет распаковывать частично
+_ZLIB_ENCODINGS = frozenset({"gzip", "deflate"})
+
+
+def parsed_body(response: httpx.Response) -> Any:
+    """Возвращает тело ответа, разобранное не более одного раза за обмен.
+
+    Тело дочитывается и разбирается как JSON кодеком клиента (см.
+    pt_http_client.codec), а если это не JSON, возвращается текст. Результат
+    сохраняется в response.extensions, поэтому все обработчики событий и
+    вызывающий код получают один и тот же объект без повторного декодирования.
+    Изменение возвращенного объекта видно всем его получателям.
+
+    Args:
+        response: Объект ответа httpx.
+
+    Returns:
+        Разобранный JSON или текст ответа.
+
+    Пример:
+        >>> response = client.get("/users/1")
+        >>> parsed_body(response)["name"]
+    """
+    try:
+        return response.extensions[_BODY_KEY]
+    except KeyError:
+        pass
+
+    response.read()
+    body = _parse_content(response.content, response.charset_encoding, codec_for(response))
+    response.extensions[_BODY_KEY] = body
+    return body
+
+
+def is_body_parsed(response: httpx.Response) -> bool:
+    """Проверяет, разобрано ли уже тело ответа через parsed_body.
+
+    Args:
+        response: Объект ответа httpx.
+
+    Returns:
+        True, если разобранное тело сохранено в response.extensions.
+    """
+    return _BODY_KEY in response.extensions
+
+
+def _parse_content(content: bytes, charset: str | None, codec: JsonCodec) -> Any:
+    """Разбирает тело как JSON, а если это не JSON, декодирует его в текст.
+
+    Args:
+        content: Тело в байтах
+        charset: Кодировка из заголовка Content-Type, по умолчанию utf-8
+        codec: Кодек JSON клиента
+
+    Returns:
+        Разобранный JSON или текст.
+    """
+    try:
+        return codec.loads(content)
+    except ValueError:
+        return content.decode(charset or "utf-8", errors="replace")
+
+
+def watch_body(response: httpx.Response, limit: int, callback: Callable[[BodyCapture], None]) -> None:
+    """Вызывает callback, когда тело ответа прочитано вызывающим кодом.
+
+    Тело не читается принудительно: поток ответа оборачивается, и по мере
+    чтения сохраняется только начало тела длиной до limit байт и общий
+    размер. Callback вызывается при закрытии потока, поэтому обработчики
+    событий не ломают client.stream(...) и не держат тело в памяти целиком.
+    Все обработчики одного ответа используют общий BodyCapture.
+
+    Args:
+        response: Объект ответа httpx.
+        limit: Сколько байт начала тела нужно обработчику
+        callback: Функция, получающая BodyCapture после закрытия потока
+    """
+    capture = response.extensions.get(_CAPTURE_KEY)
+    if capture is None:
+        capture = BodyCapture(response)
+        response.extensions[_CAPTURE_KEY] = capture
+
+    capture.watch(limit, callback)
+
+
+class BodyCapture:
+    """Начало тела ответа и его размер, собранные при чтении потока.
+
+    Атрибуты:
+        response: Объект ответа httpx
+        size: Число прочитанных байт тела (до распаковки Content-Encoding)
+        exhausted: Поток прочитан до конца
+        closed: Поток закрыт, callback вызваны
+    """
+
+    def __init__(self, response: httpx.Response) -> None:
+        """Оборачивает поток ответа или берет уже прочитанное тело.
+
+        Args:
+            response: Объект ответа httpx.
+        """
+        self.response = response
+        self.size = 0
+        self.exhausted = False
+        self.closed = False
+        self._limit = 0
+        self._prefix = bytearray()
+        self._decoded = False
+        self._callbacks: list[Callable[[BodyCapture], None]] = []
+
+        if response.is_closed:
+            self._capture_read_response()
+        else:
+            response.stream = _TeeStream(response.stream, self)
+
+    def _capture_read_response(self) -> None:
+        """Запоминает тело ответа, который уже прочитан или закрыт."""
+        try:
+            content = self.response.content
+        except httpx.ResponseNotRead:
+            content = b""
+
+        self._decoded = True
+        self._prefix += content
+        self.size = len(content)
+        self.exhausted = True
+        self.closed = True
+
+    def watch(self, limit: int, callback: Callable[[BodyCapture], None]) -> None:
+        """Регистрирует callback, вызывая его сразу, если поток уже закрыт.
+
+        Args:
+            limit: Сколько байт начала тела нужно сохранить
+            callback: Функция, получающая BodyCapture после закрытия потока
+        """
+        self._limit = max(self._limit, limit)
+        if self.closed:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def feed(self, chunk: bytes) -> None:
+        """Учитывает очередную часть тела.
+
+        Args:
+            chunk: Прочитанные байты
+        """
+        self.size += len(chunk)
+        room = self._limit + 1 - len(self._prefix)
+        if room > 0:
+            self._prefix += chunk[:room]
+
+    def finish(self) -> None:
+        """Отмечает закрытие потока и вызывает callback."""
+        if self.closed:
+            return
+
+        self.closed = True
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+    @property
+    def content_encoding(self) -> str:
+        """Значение заголовка Content-Encoding ответа в нижнем регистре."""
+        encoding: str = self.response.headers.get("content-encoding", "identity")
+        return encoding.lower()
+
+    @property
+    def charset_encoding(self) -> str | None:
+        """Кодировка тела из заголовка Content-Type."""
+        return self.response.charset_encoding
+
+    def content_prefix(self, limit: int) -> bytes | None:
+        """Возвращает начало тела после распаковки Content-Encoding.
+
+        Args:
+            limit: Максимальная длина результата плюс один байт для проверки обрезки
+
+        Returns:
+            До limit + 1 байт начала тела или None, если кодировку нельзя распаковать.
+        """
+        prefix = bytes(self._prefix)
+        encoding = self.content_encoding
+        if self._decoded or encoding == "identity":
+            return prefix[: limit + 1]
+
+        if encoding in _ZLIB_ENCODINGS:
+            # Автоопределение заголовка gzip или zlib; частичный ввод допустим
+            decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+            try:
+                return decompressor.decompress(prefix, limit + 1)
+            except zlib.error:
+                return None
+
+        return None
+
+    def parsed(self, limit: int) -> tuple[bool, Any]:
+        """Разбирает тело, если оно прочитано целиком и не длиннее limit.
+
+        Разобранное тело сохраняется в response.extensions и доступно через
+        parsed_body без повторного разбора.
+
+        Args:
+            limit: Максимальная длина тела после распаковки
+
+        Returns:
+            Пара (тело помещается в limit, разобранный JSON или текст).
+        """
+        if is_body_parsed(self.response):
+            return True, self.response.extensions[_BODY_KEY]
+
+        content = self.content_prefix(limit)
+        if content is None or not self._fits(content, limit):
+            return False, None
+
+        body = _parse_content(content, self.charset_encoding, codec_for(self.response))
+        self.response.extensions[_BODY_KEY] = body
+        return True, body
+
+    def snapshot(self, limit: int) -> BodySnapshot:
+        """Копирует начало тела без ссылки на ответ.
+
+        Тело не разбирается: снимок разбирает его при обращении. Уже
+        разобранное тело сохраняется в снимке, только если оно не длиннее limit.
+
+        Args:
+            limit: Максимальная длина тела после распаковки
+
+        Returns:
+            Снимок начала тела длиной до limit + 1 байт.
+        """
+        content = self.content_prefix(limit)
+        fits = self._fits(content, limit)
+        return BodySnapshot(
+            size=self.size,
+            content=content,
+            fits=fits,
+            body=self.response.extensions.get(_BODY_KEY, _NOT_PARSED) if fits else _NOT_PARSED,
+            content_encoding=self.content_encoding,
+            charset_encoding=self.charset_encoding,
+            codec=codec_for(self.response),
+        )
+
+    def _fits(self, content: bytes | None, limit: int) -> bool:
+        """Проверяет, что тело прочитано целиком и после распаковки не длиннее limit.
+
+        Args:
+            content: Начало тела после распаковки
+            limit: Максимальная длина тела
+
+        Returns:
+            True, если content - все тело и оно помещается в limit.
+        """
+        return self.exhausted and self.size <= self._limit and content is not None and len(content) <= limit
+
+
+_NOT_PARSED = object()
+
+
+@dataclass(frozen=True, slots=True)
+class BodySnapshot:
+    """Начало тела ответа, скопированное из BodyCapture без ссылки на ответ.
+
+    Используется отложенными вложениями: буфер хранит только начало тела
+    длиной до лимита, а разбор выполняется при формировании вложения.
+
+    Атрибуты:
+        size: Число прочитанных байт тела (до распаковки Content-Encoding)
+        content: Начало тела после распаковки или None, если кодировку нельзя распаковать
+        fits: Тело прочитано целиком и не длиннее лимита
+        body: Разобранное тело, если оно было разобрано до снимка
+        content_encoding: Значение заголовка Content-Encoding
+        charset_encoding: Кодировка тела из заголовка Content-Type
+        codec: Кодек JSON клиента
+    """
+
+    size: int
+    content: bytes | None
+    fits: bool
+    body: Any
+    content_encoding: str
+    charset_encoding: str | None
+    codec: JsonCodec
+
+    def content_prefix(self, limit: int) -> bytes | None:
+        """Возвращает начало тела после распаковки Content-Encoding.
+
+        Args:
+            limit: Максимальная длина результата плюс один байт для проверки обрезки
+
+        Returns:
+            До limit + 1 байт начала тела или None, если кодировку нельзя распаковать.
+        """
+        return None if self.content is None else self.content[: limit + 1]
+
+    def parsed(self, limit: int) -> tuple[bool, Any]:
+        """Разбирает тело, если оно прочитано целиком и не длиннее limit.
+
+        Args:
+            limit: Максимальная длина тела после распаковки
+
+        Returns:
+            Пара (тело помещается в limit, разобранный JSON или текст).
+        """
+        if not self.fits or self.content is None or len(self.content) > limit:
+            return False, None
+
+        if self.body is not _NOT_PARSED:
+            return True, self.body
+
+        return True, _parse_content(self.content, self.charset_encoding, self.codec)
+
+
+class _TeeStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Поток ответа, передающий прочитанные части в BodyCapture."""
+
+    def __init__(self, stream: httpx.SyncByteStream | httpx.AsyncByteStream, capture: BodyCapture) -> None:
+        self._stream = stream
+        self._capture = capture
+
+    def __iter__(self) -> Iterator[bytes]:
+        if not isinstance(self._stream, httpx.SyncByteStream):
+            raise RuntimeError("Attempted to call a sync iterator on an async stream.")
+
+        for chunk in self._stream:
+            self._capture.feed(chunk)
+            yield chunk
+
+        self._capture.exhausted = True
+
+    def close(self) -> None:
+        try:
+            if isinstance(self._stream, httpx.SyncByteStream):
+                self._stream.close()
+        finally:
+            self._capture.finish()
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        if not isinstance(self._stream, httpx.AsyncByteStream):
+            raise RuntimeError("Attempted to call an async iterator on a sync stream.")
+
+        async for chunk in self._stream:
+            self._capture.feed(chunk)
+            yield chunk
+
+        self._capture.exhausted = True
+
+    async def aclose(self) -> None:
+        try:
+            if isinstance(self._stream, httpx.AsyncByteStream):
+                await self._stream.aclose()
+        finally:
+            self._capture.finish()
@@ -1,20 +1,47 @@
 from __future__ import annotations
 
 import types
-from collections.abc import Callable
-from typing import Any
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import copy_context
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
 import httpx
 
-from .event_hooks.abstract_hook_handler import AbstractHookHandler
-from .event_hooks.allure_handler import AllureHandler
-from .event_hooks.curl_handler import CurlHandler
-from .event_hooks.logging_handler import LoggingHandler
+from .base_client import BaseHttpClient
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
 
 type RetryDecorator = Callable[[Callable[[], httpx.Response]], Callable[[], httpx.Response]]
 
 
-class HttpClient:
+@dataclass(frozen=True, slots=True)
+class RequestSpec:
+    """Описание запроса для пакетного выполнения через HttpClient.batch/as_completed.
+
+    Атрибуты:
+        method: HTTP метод
+        url: URL запроса относительно base_url клиента
+        headers: Заголовки запроса
+        params: Параметры строки запроса
+        json: Тело запроса в формате JSON
+        user: Пара (логин, пароль) пользователя BearerTokenAuth для этого запроса
+        kwargs: Дополнительные параметры для httpx.Client.request
+    """
+
+    method: str
+    url: str
+    headers: dict[str, str] | None = None
+    params: dict[str, Any] | None = None
+    json: dict[str, Any] | None = None
+    user: tuple[str, str] | None = None
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+class HttpClient(BaseHttpClient[httpx.Client]):
     """HTTP клиент для выполнения синхронных запросов.
 
     Класс предоставляет простой интерфейс для работы с HTTP API с поддержкой
@@ -25,6 +52,9 @@ class HttpClient:
         - Поддержка всех HTTP методов (GET, POST, PUT, PATCH, DELETE)
         - Передача параметров запроса (params, json, headers)
         - Интеграция с retry декораторами (tenacity)
+        - Пакетное выполнение запросов с ограниченной параллельностью
+        - Потоковое чтение больших ответов (stream)
+        - Запросы от разных пользователей через один пул соединений (параметр user)
         - Контекстный менеджер для безопасной работы
 
     Атрибуты:
@@ -41,40 +71,6 @@ class HttpClient:
         ...     print(response.json())
     """
 
-    def __init__(
-        self,
-        base_url: str,
-        timeout: float = 10.0,
-        verify: bool = False,
-        auth: httpx.Auth | None = None,
-        default_headers: dict[str, str] | None = None,
-        handlers: list[AbstractHookHandler] | None = None,
-        **client_kwargs: Any,
-    ) -> None:
-        """Инициализирует HTTP клиент.
-
-        Args:
-            base_url: Базовый URL для всех запросов
-                Пример: "https://api.example.com/v1"
-            timeout: Таймаут запроса по умолчанию в секундах
-            verify: Флаг проверки SSL сертификатов
-            auth: Объект аутентификации httpx (BasicAuth, BearerToken и т.д.)
-            default_headers: Заголовки по умолчанию для всех запросов
-            handlers: Обработчики запросов/ответов, см. AbstractHookHandler
-            **client_kwargs: Дополнительные параметры для httpx.Client
-                См. документацию httpx: https://www.python-httpx.org/api/#client
-
-        """
-        self.base_url = base_url.rstrip("/")
-        self.timeout = timeout
-        self.verify = verify
-        self.auth = auth
-        self.default_headers = default_headers.copy() if default_headers else {}
-        self.client_kwargs = client_kwargs
-        self._client: httpx.Client | None = None
-
-        self._handlers: list[AbstractHookHandler] = handlers or [AllureHandler(), CurlHandler(), LoggingHandler()]
-
     def __enter__(self) -> HttpClient:
         self._setup_client()
         return self
@@ -90,28 +86,12 @@ class HttpClient:
     def _update_client_hooks(self) -> None:
         """Обновляет event_hooks существующего клиента."""
         if self._client:
-            request_hooks = [hook.request_hook for hook in self._handlers]
+            request_hooks = [self._codec_request_hook, *(hook.request_hook for hook in self._handlers)]
             response_hooks = [hook.response_hook for hook in self._handlers]
 
             self._client.event_hooks["request"] = request_hooks
             self._client.event_hooks["response"] = response_hooks
 
-    def add_handler(self, handler: AbstractHookHandler) -> HttpClient:
-        """Добавляет обработчик, обновляет хуки клиента.
-
-        Args:
-            handler: Обработчик событий для добавления.
-
-        Returns:
-            Текущий экземпляр HttpClient (fluent interface).
-        """
-        self._handlers.append(handler)
-
-        if self._client:
-            self._update_client_hooks()
-
-        return self
-
     def _setup_client(self) -> httpx.Client:
         """Создает клиент httpx если он еще не создан.
 
@@ -132,10 +112,11 @@ class HttpClient:
         return self._client
 
     def close(self) -> None:
-        """Закрытие клиента httpx."""
+        """Закрытие клиента httpx и обработчиков событий."""
         if self._client:
             self._client.close()
             self._client = None
+            self._close_handlers()
 
     def _send(
         self,
@@ -145,19 +126,185 @@ class HttpClient:
         params: dict[str, Any] | None = None,
         json: dict[str, Any] | None = None,
         retry: RetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
         **kwargs: Any,
     ) -> httpx.Response:
         """Приватный метод для выполнения HTTP запроса c retry.
 
+        Запрос выполняется от пользователя user, если он передан, см.
+        BaseHttpClient._as_user. Вместо пользователя можно передать объект
+        httpx.Auth для одного запроса через kwargs["auth"].
+
         Returns:
             Ответ от сервера в виде httpx.Response.
         """
         client = self._setup_client()
+        request_headers, request_kwargs = self._encode_json(headers, json, kwargs)
 
         def do_request() -> httpx.Response:
-            return client.request(method=method, url=url, headers=headers, params=params, json=json, **kwargs)
+            return client.request(method=method, url=url, headers=request_headers, params=params, **request_kwargs)
 
-        return retry(do_request)() if retry else do_request()
+        with self._as_user(user):
+            return retry(do_request)() if retry else do_request()
+
+    @contextmanager
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        params: dict[str, Any] | None = None,
+        json: dict[str, Any] | None = None,
+        retry: RetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
+        **kwargs: Any,
+    ) -> Iterator[httpx.Response]:
+        """Выполнить запрос с потоковым чтением тела ответа.
+
+        Тело не загружается в память: его читают внутри блока with через
+        iter_bytes, iter_lines и т.д. Retry декоратор повторяет отправку
+        запроса до получения ответа; ответ отклоненной попытки закрывается.
+        Обработчики событий вызываются как для обычных запросов, встроенные
+        обработчики формируют лог и вложения при закрытии ответа.
+
+        Args:
+            method: HTTP метод
+            url: URL запроса относительно base_url
+            headers: Заголовки запроса
+            params: Параметры строки запроса
+            json: Тело запроса в формате JSON
+            retry: Retry декоратор для отправки запроса
+            user: Пара (логин, пароль) пользователя BearerTokenAuth для запроса
+            **kwargs: Дополнительные параметры, как у httpx.Client.request
+
+        Yields:
+            Ответ с непрочитанным телом; закрывается при выходе из блока.
+
+        Пример:
+            >>> with client.stream("GET", "/export") as response:
+            ...     for line in response.iter_lines():
+            ...         process(line)
+        """
+        client = self._setup_client()
+        request_headers, request_kwargs = self._encode_json(headers, json, kwargs)
+        build_kwargs, send_kwargs = self._split_send_kwargs(request_kwargs)
+        responses: list[httpx.Response] = []
+
+        def do_request() -> httpx.Response:
+            while responses:
+                responses.pop().close()
+
+            request = client.build_request(
+                method=method, url=url, headers=request_headers, params=params, **build_kwargs
+            )
+            response = client.send(request, stream=True, **send_kwargs)
+            responses.append(response)
+            return response
+
+        try:
+            with self._as_user(user):
+                response = retry(do_request)() if retry else do_request()
+            yield response
+        finally:
+            while responses:
+                responses.pop().close()
+
+    def _submit_all(
+        self,
+        executor: ThreadPoolExecutor,
+        requests: Iterable[RequestSpec],
+        retry: RetryDecorator | None,
+    ) -> list[Future[httpx.Response]]:
+        """Ставит запросы в очередь пула потоков.
+
+        Каждый запрос выполняется в копии контекста вызывающего потока, поэтому
+        contextvar-состояние (например, пользователь BearerTokenAuth.switch_to_user)
+        действует и в потоках пула.
+
+        Returns:
+            Список future в порядке входных запросов.
+        """
+        self._setup_client()
+        return [
+            executor.submit(
+                copy_context().run,
+                partial(
+                    self._send,
+                    method=spec.method,
+                    url=spec.url,
+                    headers=spec.headers,
+                    params=spec.params,
+                    json=spec.json,
+                    retry=retry,
+                    user=spec.user,
+                    **spec.kwargs,
+                ),
+            )
+            for spec in requests
+        ]
+
+    def batch(
+        self,
+        requests: Iterable[RequestSpec],
+        max_workers: int = 10,
+        retry: RetryDecorator | None = None,
+    ) -> list[httpx.Response]:
+        """Выполнить набор запросов параллельно через общий пул соединений.
+
+        Запросы выполняются в пуле из max_workers потоков, одновременно в полете
+        не больше max_workers запросов. Значение не должно превышать лимит
+        соединений httpx (limits.max_connections, по умолчанию 100), иначе потоки
+        будут ждать свободного соединения. Хуки обработчиков вызываются в потоках пула.
+
+        При первой ошибке еще не начатые запросы отменяются, а исключение пробрасывается.
+
+        Args:
+            requests: Описания запросов
+            max_workers: Максимальное число одновременных запросов
+            retry: Retry декоратор, применяемый к каждому запросу
+
+        Returns:
+            Ответы в порядке входных запросов.
+        """
+        from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="http-batch") as executor:
+            futures = self._submit_all(executor, requests, retry)
+            try:
+                return [future.result() for future in futures]
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
+
+    def as_completed(
+        self,
+        requests: Iterable[RequestSpec],
+        max_workers: int = 10,
+        retry: RetryDecorator | None = None,
+    ) -> Iterator[tuple[int, httpx.Response]]:
+        """Выполнить набор запросов параллельно, отдавая ответы по мере готовности.
+
+        Параметры и ограничения такие же, как у batch.
+
+        Args:
+            requests: Описания запросов
+            max_workers: Максимальное число одновременных запросов
+            retry: Retry декоратор, применяемый к каждому запросу
+
+        Yields:
+            Пары (индекс запроса во входной последовательности, ответ).
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed  # noqa: PLC0415
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="http-batch") as executor:
+            futures = self._submit_all(executor, requests, retry)
+            indexes = {future: index for index, future in enumerate(futures)}
+            try:
+                for future in as_completed(futures):
+                    yield indexes[future], future.result()
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
 
     def get(
         self,
@@ -166,6 +313,7 @@ class HttpClient:
         params: dict[str, Any] | None = None,
         json: dict[str, Any] | None = None,
         retry: RetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
         **kwargs: Any,
     ) -> httpx.Response:
         """Выполнить GET запрос.
@@ -173,7 +321,9 @@ class HttpClient:
         Returns:
             Ответ от сервера в виде httpx.Response.
         """
-        return self._send(method="GET", url=url, headers=headers, params=params, json=json, retry=retry, **kwargs)
+        return self._send(
+            method="GET", url=url, headers=headers, params=params, json=json, retry=retry, user=user, **kwargs
+        )
 
     def post(
         self,
@@ -182,6 +332,7 @@ class HttpClient:
         params: dict[str, Any] | None = None,
         json: dict[str, Any] | None = None,
         retry: RetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
         **kwargs: Any,
     ) -> httpx.Response:
         """Выполнить POST запрос.
@@ -189,7 +340,9 @@ class HttpClient:
         Returns:
             Ответ от сервера в виде httpx.Response.
         """
-        return self._send(method="POST", url=url, headers=headers, params=params, json=json, retry=retry, **kwargs)
+        return self._send(
+            method="POST", url=url, headers=headers, params=params, json=json, retry=retry, user=user, **kwargs
+        )
 
     def put(
         self,
@@ -198,6 +351,7 @@ class HttpClient:
         params: dict[str, Any] | None = None,
         json: dict[str, Any] | None = None,
         retry: RetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
         **kwargs: Any,
     ) -> httpx.Response:
         """Выполнить PUT запрос.
@@ -205,7 +359,9 @@ class HttpClient:
         Returns:
             Ответ от сервера в виде httpx.Response.
         """
-        return self._send(method="PUT", url=url, headers=headers, params=params, json=json, retry=retry, **kwargs)
+        return self._send(
+            method="PUT", url=url, headers=headers, params=params, json=json, retry=retry, user=user, **kwargs
+        )
 
     def patch(
         self,
@@ -214,6 +370,7 @@ class HttpClient:
         params: dict[str, Any] | None = None,
         json: dict[str, Any] | None = None,
         retry: RetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
         **kwargs: Any,
     ) -> httpx.Response:
         """Выполнить PATCH запрос.
@@ -221,7 +378,9 @@ class HttpClient:
         Returns:
             Ответ от сервера в виде httpx.Response.
         """
-        return self._send(method="PATCH", url=url, headers=headers, params=params, json=json, retry=retry, **kwargs)
+        return self._send(
+            method="PATCH", url=url, headers=headers, params=params, json=json, retry=retry, user=user, **kwargs
+        )
 
     def delete(
         self,
@@ -230,6 +389,7 @@ class HttpClient:
         params: dict[str, Any] | None = None,
         json: dict[str, Any] | None = None,
         retry: RetryDecorator | None = None,
+        user: tuple[str, str] | None = None,
         **kwargs: Any,
     ) -> httpx.Response:
         """Выполнить DELETE запрос.
@@ -237,4 +397,6 @@ class HttpClient:
         Returns:
             Ответ от сервера в виде httpx.Response.
         """
-        return self._send(method="DELETE", url=url, headers=headers, params=params, json=json, retry=retry, **kwargs)
+        return self._send(
+            method="DELETE", url=url, headers=headers, params=params, json=json, retry=retry, user=user, **kwargs
+        )
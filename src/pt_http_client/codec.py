@@ -0,0 +1,257 @@
+import json
+from abc import ABC, abstractmethod
+from importlib.util import find_spec
+from typing import Any
+
+import httpx
+
+_CODEC_KEY = "pt_http_client.codec"
+
+
+class JsonCodec(ABC):
+    """Кодек JSON для тел запросов, ответов и вложений обработчиков.
+
+    Клиент кодирует им параметр json запроса и передает его обработчикам
+    через request.extensions, см. codec_for.
+
+    Пример:
+        class CustomCodec(JsonCodec):
+            def dumps(self, obj: Any) -> bytes: ...
+            def loads(self, data: bytes | str) -> Any: ...
+            def dumps_pretty(self, obj: Any) -> str: ...
+    """
+
+    name: str
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """Компактно кодирует объект в JSON в кодировке UTF-8.
+
+        Args:
+            obj: Объект для кодирования
+
+        Returns:
+            JSON в байтах.
+        """
+
+    @abstractmethod
+    def loads(self, data: bytes | str) -> Any:
+        """Разбирает JSON.
+
+        Args:
+            data: JSON в байтах или строкой
+
+        Returns:
+            Разобранный объект.
+
+        Raises:
+            ValueError: Если данные не являются корректным JSON.
+        """
+
+    @abstractmethod
+    def dumps_pretty(self, obj: Any) -> str:
+        """Кодирует объект в JSON с отступом 2 для отчетов.
+
+        Args:
+            obj: Объект для кодирования
+
+        Returns:
+            Форматированный JSON строкой.
+        """
+
+
+class StdlibJsonCodec(JsonCodec):
+    """Кодек на модуле json стандартной библиотеки, с теми же настройками, что у httpx."""
+
+    name = "stdlib"
+
+    def dumps(self, obj: Any) -> bytes:
+        """Компактно кодирует объект в JSON в кодировке UTF-8.
+
+        Args:
+            obj: Объект для кодирования
+
+        Returns:
+            JSON в байтах.
+        """
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+    def loads(self, data: bytes | str) -> Any:
+        """Разбирает JSON.
+
+        Args:
+            data: JSON в байтах или строкой
+
+        Returns:
+            Разобранный объект.
+        """
+        return json.loads(data)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        """Кодирует объект в JSON с отступом 2 для отчетов.
+
+        Args:
+            obj: Объект для кодирования
+
+        Returns:
+            Форматированный JSON строкой.
+        """
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+class OrjsonCodec(JsonCodec):
+    """Кодек на orjson. Ключи dict, не являющиеся строками, кодируются строками, как в json."""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        """Импортирует orjson; если он не установлен, возникает ImportError."""
+        import orjson  # noqa: PLC0415
+
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        """Компактно кодирует объект в JSON в кодировке UTF-8.
+
+        Args:
+            obj: Объект для кодирования
+
+        Returns:
+            JSON в байтах.
+        """
+        result: bytes = self._orjson.dumps(obj, option=self._options)
+        return result
+
+    def loads(self, data: bytes | str) -> Any:
+        """Разбирает JSON. orjson.JSONDecodeError наследует json.JSONDecodeError.
+
+        Args:
+            data: JSON в байтах или строкой
+
+        Returns:
+            Разобранный объект.
+        """
+        return self._orjson.loads(data)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        """Кодирует объект в JSON с отступом 2 для отчетов.
+
+        Args:
+            obj: Объект для кодирования
+
+        Returns:
+            Форматированный JSON строкой.
+        """
+        result: bytes = self._orjson.dumps(obj, option=self._options | self._orjson.OPT_INDENT_2)
+        return result.decode("utf-8")
+
+
+class MsgspecCodec(JsonCodec):
+    """Кодек на msgspec.json."""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        """Импортирует msgspec; если он не установлен, возникает ImportError."""
+        import msgspec  # noqa: PLC0415
+
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        """Компактно кодирует объект в JSON в кодировке UTF-8.
+
+        Args:
+            obj: Объект для кодирования
+
+        Returns:
+            JSON в байтах.
+        """
+        result: bytes = self._encoder.encode(obj)
+        return result
+
+    def loads(self, data: bytes | str) -> Any:
+        """Разбирает JSON.
+
+        Args:
+            data: JSON в байтах или строкой
+
+        Returns:
+            Разобранный объект.
+
+        Raises:
+            ValueError: Если данные не являются корректным JSON.
+        """
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    def dumps_pretty(self, obj: Any) -> str:
+        """Кодирует объект в JSON с отступом 2 для отчетов.
+
+        Args:
+            obj: Объект для кодирования
+
+        Returns:
+            Форматированный JSON строкой.
+        """
+        result: bytes = self._msgspec.json.format(self._encoder.encode(obj), indent=2)
+        return result.decode("utf-8")
+
+
+CODECS: dict[str, type[JsonCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "stdlib": StdlibJsonCodec,
+}
+
+STDLIB_CODEC = StdlibJsonCodec()
+
+
+def get_codec(codec: str | JsonCodec = "auto") -> JsonCodec:
+    """Возвращает кодек JSON по имени.
+
+    Args:
+        codec: Экземпляр JsonCodec или имя: "auto" (orjson или msgspec, если
+            установлены, иначе stdlib), "orjson", "msgspec", "stdlib"
+
+    Returns:
+        Экземпляр кодека.
+
+    Raises:
+        ValueError: Если имя кодека неизвестно.
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+
+    if codec == "auto":
+        codec = next((name for name in ("orjson", "msgspec") if find_spec(name)), "stdlib")
+
+    if codec == "stdlib":
+        return STDLIB_CODEC
+
+    try:
+        return CODECS[codec]()
+    except KeyError:
+        raise ValueError(f"Неизвестный кодек JSON: {codec}. Доступны: auto, {', '.join(CODECS)}") from None
+
+
+def codec_for(message: httpx.Request | httpx.Response) -> JsonCodec:
+    """Возвращает кодек клиента, отправившего запрос.
+
+    Args:
+        message: Запрос или ответ httpx
+
+    Returns:
+        Кодек из request.extensions или кодек стандартной библиотеки.
+    """
+    try:
+        request = message if isinstance(message, httpx.Request) else message.request
+    except RuntimeError:
+        return STDLIB_CODEC
+
+    codec: JsonCodec = request.extensions.get(_CODEC_KEY, STDLIB_CODEC)
+    return codec
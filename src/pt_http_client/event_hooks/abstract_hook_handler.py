@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
 from typing import Any
 
 import httpx
 
+from ..body import BodyCapture, BodySnapshot, watch_body
+from .snapshots import RequestSnapshot, ResponseSnapshot
+
 
 class AbstractHookHandler(ABC):
     """Абстрактный базовый класс для обработчиков событий httpx.
@@ -22,8 +26,18 @@ class AbstractHookHandler(ABC):
             @staticmethod
             def response_hook(response: httpx.Response) -> None:
                 print(f"Response: {response.status_code}")
+
+    Атрибуты:
+        max_body_length: Максимальная длина тела в отчетах и логах, в символах
+        streaming_safe: Хуки не читают тело ответа, см. _watch_response_body
     """
 
+    MAX_BODY_LENGTH = 40000
+    TRUNCATE_MESSAGE = "... [Данные обрезаны]"
+
+    max_body_length: int = MAX_BODY_LENGTH
+    streaming_safe: bool = False
+
     @abstractmethod
     def request_hook(self, request: httpx.Request) -> None:
         """Обработчик события запроса.
@@ -46,10 +60,81 @@ class AbstractHookHandler(ABC):
         """
         pass
 
-    @staticmethod
-    def _truncate_body(data: Any) -> Any:
+    async def async_request_hook(self, request: httpx.Request) -> None:
+        """Асинхронный обработчик события запроса для httpx.AsyncClient.
+
+        По умолчанию вызывает синхронный request_hook. Переопределите метод,
+        если обработчику нужен неблокирующий ввод-вывод.
+
+        Args:
+            request: Объект запроса httpx.
+        """
+        self.request_hook(request)
+
+    async def async_response_hook(self, response: httpx.Response) -> None:
+        """Асинхронный обработчик события ответа для httpx.AsyncClient.
+
+        По умолчанию дочитывает тело ответа без блокировки event loop и
+        вызывает синхронный response_hook: синхронное чтение асинхронного
+        потока в httpx невозможно. Обработчики со streaming_safe = True
+        не читают тело в хуке, для них response_hook вызывается сразу.
+
+        Args:
+            response: Объект ответа httpx.
+        """
+        if not self.streaming_safe:
+            await response.aread()
+        self.response_hook(response)
+
+    def request_snapshot(self, request: httpx.Request) -> RequestSnapshot:
+        """Копирует данные запроса для request_snapshot_hook.
+
+        По умолчанию сохраняется начало тела длиной max_body_length.
+
+        Args:
+            request: Объект запроса httpx.
+
+        Returns:
+            Снимок запроса.
+        """
+        return RequestSnapshot.from_request(request, self.max_body_length)
+
+    def request_snapshot_hook(self, request: RequestSnapshot) -> None:
+        """Обработчик снимка запроса, например в фоновом потоке BackgroundHandler.
+
+        По умолчанию вызывает request_hook с восстановленным запросом.
+        Переопределите метод, если обработчик умеет работать со снимком.
+
+        Args:
+            request: Снимок запроса
+        """
+        self.request_hook(request.to_request())
+
+    def response_snapshot_hook(self, response: ResponseSnapshot) -> None:
+        """Обработчик снимка ответа, например в фоновом потоке BackgroundHandler.
+
+        По умолчанию вызывает response_hook с восстановленным ответом, тело
+        которого - начало тела длиной до max_body_length.
+
+        Args:
+            response: Снимок ответа
+        """
+        self.response_hook(response.to_response())
+
+    def close(self) -> None:  # noqa: B027
+        """Освобождает ресурсы обработчика при закрытии клиента.
+
+        По умолчанию ничего не делает. Вызывается из HttpClient.close и
+        AsyncHttpClient.aclose.
+        """
+
+    def _truncate_body(self, data: Any) -> Any:
         """Обрезает тело запроса/ответа.
 
+        Строковое представление dict и list строится по частям и прекращается
+        при достижении max_body_length, поэтому время и память зависят от
+        лимита, а не от размера тела.
+
         Args:
             data: Данные, которые нужно обрезать. Может быть dict, list или str.
 
@@ -57,12 +142,103 @@ class AbstractHookHandler(ABC):
             Оригинальные данные, если они короче максимальной длины,
             или обрезанная версия.
         """
-        max_body_length = 40000
-        truncate_message = "... [Данные обрезаны]"
-
-        if isinstance(data, (dict, list, str)):
-            data_str = str(data)
-            if len(data_str) > max_body_length:
-                return data_str[:max_body_length] + truncate_message
+        if isinstance(data, str):
+            if len(data) > self.max_body_length:
+                return data[: self.max_body_length] + self.TRUNCATE_MESSAGE
+            return data
+
+        if isinstance(data, (dict, list)):
+            length = 0
+            parts = []
+            for part in _repr_parts(data, self.max_body_length):
+                parts.append(part)
+                length += len(part)
+                if length > self.max_body_length:
+                    return "".join(parts)[: self.max_body_length] + self.TRUNCATE_MESSAGE
 
         return data
+
+    def _watch_response_body(self, response: httpx.Response, callback: Callable[[BodyCapture], None]) -> None:
+        """Вызывает callback, когда вызывающий код прочитает тело ответа.
+
+        Хук не читает тело сам, поэтому потоковые ответы (client.stream)
+        остаются потоковыми, а в памяти хранится только начало тела длиной
+        max_body_length, см. pt_http_client.body.watch_body.
+
+        Args:
+            response: Объект ответа httpx.
+            callback: Функция, получающая BodyCapture после закрытия потока
+        """
+        watch_body(response, self.max_body_length, callback)
+
+    def _body_preview(self, capture: BodyCapture | BodySnapshot) -> Any:
+        """Возвращает обрезанное тело ответа для отчета или лога.
+
+        Тело длиннее max_body_length не разбирается: берется его начало.
+
+        Args:
+            capture: Начало тела ответа, собранное при чтении потока, или его снимок
+
+        Returns:
+            Обрезанное тело ответа или None, если тело пустое.
+        """
+        fits, body = capture.parsed(self.max_body_length)
+        if fits:
+            return self._truncate_body(body) if body else None
+
+        content = capture.content_prefix(self.max_body_length)
+        if content is None:
+            return f"[{capture.size} байт, Content-Encoding: {capture.content_encoding}]"
+
+        return self._content_prefix(content, capture.charset_encoding)
+
+    def _content_prefix(self, content: bytes, encoding: str | None) -> str:
+        """Декодирует начало тела длиной max_body_length.
+
+        Args:
+            content: Тело запроса или ответа в байтах
+            encoding: Кодировка тела, по умолчанию utf-8
+
+        Returns:
+            Начало тела с пометкой об обрезке.
+        """
+        prefix = content[: self.max_body_length].decode(encoding or "utf-8", errors="replace")
+        return prefix + self.TRUNCATE_MESSAGE
+
+
+def _repr_parts(data: Any, limit: int) -> Iterator[str]:
+    """Строит str(data) по частям для вложенных dict и list.
+
+    Длинные строки заранее обрезаются до limit символов, так как дальше
+    лимита вывод все равно не используется.
+
+    Args:
+        data: Данные для преобразования в строку
+        limit: Максимальная длина, после которой части не нужны
+
+    Yields:
+        Последовательные части строкового представления.
+    """
+    if isinstance(data, dict):
+        yield "{"
+        for index, (key, value) in enumerate(data.items()):
+            if index:
+                yield ", "
+            yield from _repr_parts(key, limit)
+            yield ": "
+            yield from _repr_parts(value, limit)
+        yield "}"
+
+    elif isinstance(data, list):
+        yield "["
+        for index, value in enumerate(data):
+            if index:
+                yield ", "
+            yield from _repr_parts(value, limit)
+        yield "]"
+
+    elif isinstance(data, str) and len(data) > limit:
+        yield repr(data[: limit + 1])
+
+    else:
+        yield repr(data)
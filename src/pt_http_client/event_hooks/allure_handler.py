@@ -1,56 +1,101 @@
-import json
+from functools import partial
+from typing import Any
 
 import allure
 import httpx
 
-from .abstract_hook_handler import AbstractHookHandler
+from ..body import BodyCapture
+from .deferred_handler import DeferredAttachmentHandler
+from .snapshots import RequestSnapshot, ResponseSnapshot
 
 
-class AllureHandler(AbstractHookHandler):
-    """Обработчик для прикрепления запросов и ответов в Allure."""
+class AllureHandler(DeferredAttachmentHandler):
+    """Обработчик для прикрепления запросов и ответов в Allure.
+
+    Вложения сериализуются кодеком JSON клиента, см. pt_http_client.codec.
+
+    С failures_only=True вложения прикрепляются только для последних
+    обменов перед ответом с ошибкой или падением теста, см.
+    DeferredAttachmentHandler.
+    """
 
     def request_hook(self, request: httpx.Request) -> None:
         """Хук для обработки запроса."""
-        body = request.content.decode("utf-8")
-        try:
-            body = json.loads(body)
-        except json.JSONDecodeError:
-            pass
+        self.request_snapshot_hook(self.request_snapshot(request))
+
+    def request_snapshot_hook(self, request: RequestSnapshot) -> None:
+        """Хук для обработки снимка запроса."""
+        self._attach(request.exchange, partial(self._attach_request, request))
+
+    def response_hook(self, response: httpx.Response) -> None:
+        """Хук для обработки ответа.
+
+        Вложение формируется после того, как вызывающий код прочитает тело,
+        поэтому потоковые ответы не загружаются в память целиком.
+        """
+        self._watch_response_body(response, partial(self._on_response_body, response))
+
+    def _on_response_body(self, response: httpx.Response, capture: BodyCapture) -> None:
+        """Прикрепляет ответ после закрытия потока.
+
+        Args:
+            response: Объект ответа httpx.
+            capture: Начало тела ответа, собранное при чтении потока
+        """
+        body = capture.snapshot(self.max_body_length) if self.failures_only else capture
+        self.response_snapshot_hook(ResponseSnapshot.from_response(response, body))
+
+    def response_snapshot_hook(self, response: ResponseSnapshot) -> None:
+        """Хук для обработки снимка ответа, поток которого уже закрыт."""
+        self._attach(response.exchange, partial(self._attach_response, response))
+        self._flush_on_error(response.status_code)
+
+    def _attach_request(self, request: RequestSnapshot) -> None:
+        """Прикрепляет запрос к Allure отчету.
+
+        Args:
+            request: Снимок запроса
+        """
+        body: Any
+        if request.truncated:
+            body = self._content_prefix(request.content, "utf-8")
+        else:
+            body = request.content.decode("utf-8", errors="replace")
+            try:
+                body = self._truncate_body(request.codec.loads(body))
+            except ValueError:
+                pass
 
         request_info = {
             "method": request.method,
             "url": str(request.url),
             "headers": dict(request.headers),
             "params": dict(request.url.params) or None,
-            "body": self._truncate_body(body),
+            "body": body,
         }
 
         allure.attach(
-            body=json.dumps(request_info, indent=2, ensure_ascii=False),
+            body=request.codec.dumps_pretty(request_info),
             name=f"Request: {request.method} {request.url.path}",
             attachment_type=allure.attachment_type.JSON,
         )
 
-    def response_hook(self, response: httpx.Response) -> None:
-        """Хук для обработки ответа."""
-        response.read()
-
-        method = response.request.method
-        url = str(response.url)
-
-        try:
-            body = response.json()
-        except json.JSONDecodeError:
-            body = response.text
+    def _attach_response(self, response: ResponseSnapshot) -> None:
+        """Прикрепляет ответ к Allure отчету.
 
+        Args:
+            response: Снимок ответа
+        """
         response_info = {
             "status_code": response.status_code,
-            "elapsed_seconds": response.elapsed.total_seconds(),
-            "body": self._truncate_body(body) if body else None,
+            "elapsed_seconds": response.elapsed_seconds,
+            "size": response.body.size,
+            "headers": dict(response.headers),
+            "body": self._body_preview(response.body),
         }
 
         allure.attach(
-            body=json.dumps(response_info, indent=2, ensure_ascii=False),
-            name=f"Response: {method} {url}",
+            body=response.codec.dumps_pretty(response_info),
+            name=f"Response: {response.method} {response.url}",
             attachment_type=allure.attachment_type.JSON,
         )
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import logging
+import queue
+import sys
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import partial
+from threading import Lock, Thread, current_thread
+from typing import Any, ClassVar
+from weakref import WeakSet
+
+import httpx
+
+from ..body import BodyCapture, watch_body
+from .abstract_hook_handler import AbstractHookHandler
+from .snapshots import ResponseSnapshot
+
+logger = logging.getLogger(__name__)
+
+type Task = Callable[[], None]
+
+
+class BackgroundHandler(AbstractHookHandler):
+    """Обертка, выполняющая хуки обработчика в фоновом потоке.
+
+    Хуки обертки только ставят запрос или ответ в ограниченную очередь, а
+    сериализацию, генерацию cURL и запись вложений выполняет рабочий поток.
+    Так время обработчиков не добавляется к задержке запросов. Хук ответа
+    ставится в очередь после закрытия потока ответа, поэтому обработчик
+    получает уже прочитанный ответ и не соревнуется с вызывающим кодом.
+    В очередь попадают не сами запрос и ответ, а их снимки (request_snapshot_hook
+    и response_snapshot_hook обработчика) с началом тела длиной до
+    max_body_length: очередь не удерживает тела ответов, а повтор запроса
+    после 401 не меняет уже поставленный в очередь запрос.
+
+    Если очередь заполнена, событие отбрасывается и учитывается в dropped.
+    Очередь выгружается при закрытии клиента (close) и плагином pytest после
+    каждой фазы теста. Если загружен allure, задача запоминает контекст
+    Allure (тест и шаги) потока, поставившего ее в очередь, и выполняется в
+    нем, поэтому вложения попадают в тест, отправивший запрос, а не в тест,
+    при котором был запущен рабочий поток.
+
+    Основные возможности:
+        - Неблокирующие хуки для любого AbstractHookHandler
+        - Ограниченная очередь со счетчиком отброшенных событий
+        - Ожидание выгрузки очереди через flush
+
+    Атрибуты:
+        handler: Обработчик, хуки которого выполняются в фоне
+        max_backlog: Максимальный размер очереди
+        dropped: Число событий, отброшенных из-за заполненной очереди
+        errors: Число ошибок в хуках обработчика
+
+    Пример:
+        >>> client = HttpClient(base_url=url, handlers=[BackgroundHandler(AllureHandler())])
+    """
+
+    DEFAULT_MAX_BACKLOG = 10_000
+
+    streaming_safe = True
+
+    _instances: ClassVar[WeakSet[BackgroundHandler]] = WeakSet()
+    _instances_lock: ClassVar[Lock] = Lock()
+
+    def __init__(self, handler: AbstractHookHandler, max_backlog: int = DEFAULT_MAX_BACKLOG) -> None:
+        """Инициализирует обертку.
+
+        Args:
+            handler: Обработчик, хуки которого выполняются в фоне
+            max_backlog: Максимальный размер очереди
+        """
+        self.handler = handler
+        self.max_backlog = max_backlog
+        self.dropped = 0
+        self.errors = 0
+        self._queue: queue.Queue[Task | None] = queue.Queue(maxsize=max_backlog)
+        self._worker: Thread | None = None
+        self._lock = Lock()
+
+        with self._instances_lock:
+            self._instances.add(self)
+
+    @property
+    def backlog(self) -> int:
+        """Число событий, ожидающих обработки."""
+        return self._queue.qsize()
+
+    def request_hook(self, request: httpx.Request) -> None:
+        """Ставит снимок запроса в очередь."""
+        self._submit(partial(self.handler.request_snapshot_hook, self.handler.request_snapshot(request)))
+
+    def response_hook(self, response: httpx.Response) -> None:
+        """Ставит снимок ответа в очередь после закрытия потока ответа."""
+        watch_body(response, self.handler.max_body_length, partial(self._on_response_body, response))
+
+    def _on_response_body(self, response: httpx.Response, capture: BodyCapture) -> None:
+        """Ставит снимок ответа в очередь.
+
+        Args:
+            response: Объект ответа httpx.
+            capture: Начало тела ответа, собранное при чтении потока
+        """
+        snapshot = ResponseSnapshot.from_response(response, capture.snapshot(self.handler.max_body_length))
+        self._submit(partial(self.handler.response_snapshot_hook, snapshot))
+
+    def _submit(self, task: Task) -> None:
+        """Ставит задачу в очередь, запуская рабочий поток при необходимости.
+
+        Args:
+            task: Вызов хука обработчика
+        """
+        task = _bind_allure_context(task)
+        with self._lock:
+            try:
+                self._queue.put_nowait(task)
+            except queue.Full:
+                self.dropped += 1
+                return
+
+            if self._worker is None:
+                self._worker = Thread(target=self._run, name="http-hooks", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        """Выполняет задачи из очереди до получения None."""
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    return
+                task()
+            except Exception:
+                self.errors += 1
+                logger.exception("Ошибка фонового обработчика %s", type(self.handler).__name__)
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Ждет обработки всех событий, поставленных в очередь.
+
+        Args:
+            timeout: Максимальное время ожидания в секундах, None - без ограничения
+
+        Returns:
+            True, если очередь выгружена, False при истечении таймаута.
+        """
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def close(self) -> None:
+        """Выгружает очередь и останавливает рабочий поток.
+
+        Поток запускается снова при следующем событии.
+        """
+        with self._lock:
+            worker, self._worker = self._worker, None
+            if worker is not None:
+                self._queue.put(None)
+
+        if worker is not None:
+            worker.join()
+        self.handler.close()
+
+    @classmethod
+    def flush_all(cls, timeout: float | None = None) -> None:
+        """Выгружает очереди всех фоновых обработчиков.
+
+        Args:
+            timeout: Максимальное время ожидания каждой очереди в секундах
+        """
+        with cls._instances_lock:
+            handlers = list(cls._instances)
+
+        for handler in handlers:
+            handler.flush(timeout)
+
+
+def _bind_allure_context(task: Task) -> Task:
+    """Привязывает задачу к контексту Allure текущего потока.
+
+    allure-pytest хранит текущий тест и шаги отдельно для каждого потока, а
+    новому потоку один раз копирует контекст главного потока. Долгоживущий
+    рабочий поток поэтому прикреплял бы все вложения к первому тесту. allure
+    не импортируется, если он еще не загружен. Контексты хранятся во
+    внутреннем атрибуте allure-python: если в другой версии его нет, задача
+    выполняется без привязки.
+
+    Args:
+        task: Вызов хука обработчика
+
+    Returns:
+        Задача, выполняемая в копии контекста Allure, или исходная задача.
+    """
+    reporter = sys.modules.get("allure_commons.reporter")
+    if reporter is None:
+        return task
+
+    contexts = getattr(getattr(reporter, "ThreadContextItems", None), "_thread_context", None)
+    if not isinstance(contexts, dict):
+        return task
+
+    context = contexts.get(current_thread())
+    if not context:
+        return task
+
+    return partial(_run_in_allure_context, contexts, OrderedDict(context), task)
+
+
+def _run_in_allure_context(contexts: dict[Thread, Any], context: OrderedDict[str, Any], task: Task) -> None:
+    """Выполняет задачу в переданном контексте Allure.
+
+    Args:
+        contexts: Контексты Allure по потокам
+        context: Копия контекста потока, поставившего задачу в очередь
+        task: Вызов хука обработчика
+    """
+    thread = current_thread()
+    contexts[thread] = context
+    try:
+        task()
+    finally:
+        contexts.pop(thread, None)
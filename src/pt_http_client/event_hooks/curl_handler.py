@@ -1,21 +1,63 @@
+from functools import partial
+
 import allure
 import httpx
 from curlify2 import Curlify
 
-from .abstract_hook_handler import AbstractHookHandler
+from .deferred_handler import DeferredAttachmentHandler
+from .snapshots import RequestSnapshot, ResponseSnapshot
+
 
+class CurlHandler(DeferredAttachmentHandler):
+    """Обработчик для генерации cURL команд из HTTP запросов.
 
-class CurlHandler(AbstractHookHandler):
-    """Обработчик для генерации cURL команд из HTTP запросов."""
+    С failures_only=True команды генерируются только для последних
+    запросов перед ответом с ошибкой или падением теста, см.
+    DeferredAttachmentHandler. Тело запроса длиннее max_body_length в
+    отложенной команде обрезается.
+    """
 
     def request_hook(self, request: httpx.Request) -> None:
         """Хук для обработки запроса.
 
         Генерирует cURL команду из запроса и прикрепляет ее к Allure отчету.
 
+        """
+        self.request_snapshot_hook(self.request_snapshot(request))
+
+    def request_snapshot(self, request: httpx.Request) -> RequestSnapshot:
+        """Копирует запрос, тело обрезается только для отложенных команд.
+
+        Args:
+            request: Объект запроса httpx.
+
+        Returns:
+            Снимок запроса.
+        """
+        limit = self.max_body_length if self.failures_only else None
+        return RequestSnapshot.from_request(request, limit)
+
+    def request_snapshot_hook(self, request: RequestSnapshot) -> None:
+        """Хук для обработки снимка запроса."""
+        self._attach(request.exchange, partial(self._attach_curl, request))
+
+    def response_hook(self, response: httpx.Response) -> None:
+        """Выгружает отложенные команды, если ответ завершился ошибкой."""
+        self._flush_on_error(response.status_code)
+
+    def response_snapshot_hook(self, response: ResponseSnapshot) -> None:
+        """Выгружает отложенные команды, если ответ завершился ошибкой."""
+        self._flush_on_error(response.status_code)
+
+    @staticmethod
+    def _attach_curl(request: RequestSnapshot) -> None:
+        """Генерирует cURL команду и прикрепляет ее к Allure отчету.
+
+        Args:
+            request: Снимок запроса
         """
         try:
-            curl_command = Curlify(request).to_curl()
+            curl_command = Curlify(request.to_request()).to_curl()
 
             # Заменяем некорректные значения в теле запроса, bug библиотеки
             curl_command = curl_command.replace("-d 'b'''", "-d 'None'")
@@ -32,7 +74,3 @@ class CurlHandler(AbstractHookHandler):
                 name="cURL Generation Error",
                 attachment_type=allure.attachment_type.TEXT,
             )
-
-    def response_hook(self, response: httpx.Response) -> None:
-        """Для cURL команд ответ не требуется, метод оставляем пустым."""
-        pass
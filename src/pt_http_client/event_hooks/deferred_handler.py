@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import Callable
+from threading import Lock
+from typing import Any, ClassVar
+from weakref import WeakSet
+
+import httpx
+
+from .abstract_hook_handler import AbstractHookHandler
+
+logger = logging.getLogger(__name__)
+
+type Render = Callable[[], None]
+
+_EXCHANGE_KEY = "pt_http_client.deferred_exchange"
+
+
+class DeferredAttachmentHandler(AbstractHookHandler):
+    """Базовый класс обработчиков, прикрепляющих данные к отчету.
+
+    В обычном режиме вложение формируется сразу в хуке. В режиме
+    failures_only хук лишь запоминает функцию формирования вложения в
+    кольцевом буфере на buffer_size обменов запрос/ответ, а сериализация и
+    прикрепление выполняются, только если ответ завершился ошибкой (код >= 400)
+    или упал тест (см. pt_http_client.pytest_plugin). Так успешные тесты с
+    тысячами запросов не тратят время на отчеты, которые никто не читает.
+
+    Функции формирования получают RequestSnapshot и ResponseSnapshot (см.
+    pt_http_client.event_hooks.snapshots), а не сами запрос и ответ, поэтому
+    буфер хранит только начало тел длиной max_body_length, а не тела целиком.
+
+    Основные возможности:
+        - Кольцевой буфер последних обменов запрос/ответ
+        - Выгрузка буфера при ответе с ошибкой
+        - Выгрузка буферов всех обработчиков через flush_all
+
+    Атрибуты:
+        failures_only: Прикреплять вложения только при ошибке
+        buffer_size: Число последних обменов в буфере
+        max_body_length: Максимальная длина тела во вложении, в символах
+    """
+
+    DEFAULT_BUFFER_SIZE = 50
+
+    streaming_safe = True
+
+    _instances: ClassVar[WeakSet[DeferredAttachmentHandler]] = WeakSet()
+    _instances_lock: ClassVar[Lock] = Lock()
+
+    def __init__(
+        self,
+        failures_only: bool = False,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        max_body_length: int = AbstractHookHandler.MAX_BODY_LENGTH,
+    ) -> None:
+        """Инициализирует обработчик.
+
+        Args:
+            failures_only: Откладывать вложения и прикреплять их только при ошибке
+            buffer_size: Число последних обменов в буфере
+            max_body_length: Максимальная длина тела во вложении, в символах
+        """
+        self.failures_only = failures_only
+        self.max_body_length = max_body_length
+        self.buffer_size = buffer_size
+        self._pending: deque[list[Render]] = deque(maxlen=buffer_size)
+        self._exchange_key = f"{_EXCHANGE_KEY}.{id(self)}"
+
+        with self._instances_lock:
+            self._instances.add(self)
+
+    def _attach(self, exchange: dict[str, Any], render: Render) -> None:
+        """Выполняет формирование вложения сразу или откладывает его в буфер.
+
+        Вложения одного обмена занимают в буфере одну запись: обмен
+        находится по request.extensions. Пустая запись означает, что обмен
+        уже выгружен, и следующее вложение занимает новую запись.
+
+        Args:
+            exchange: request.extensions запроса, к обмену которого относится вложение
+            render: Функция, формирующая и прикрепляющая вложение
+        """
+        if not self.failures_only:
+            render()
+            return
+
+        renders: list[Render] | None = exchange.get(self._exchange_key)
+        if renders:
+            renders.append(render)
+        else:
+            renders = [render]
+            exchange[self._exchange_key] = renders
+            self._pending.append(renders)
+
+    def _flush_on_error(self, status_code: int) -> None:
+        """Выгружает буфер, если ответ завершился ошибкой.
+
+        Args:
+            status_code: Код ответа
+        """
+        if self.failures_only and status_code >= httpx.codes.BAD_REQUEST:
+            self.flush()
+
+    def flush(self) -> int:
+        """Формирует и прикрепляет все отложенные вложения.
+
+        Ошибка формирования одного вложения логируется и не мешает остальным:
+        flush вызывается плагином pytest, и исключение прервало бы весь прогон.
+
+        Returns:
+            Число прикрепленных вложений.
+        """
+        flushed = 0
+        while True:
+            try:
+                renders = self._pending.popleft()
+            except IndexError:
+                return flushed
+
+            for render in renders:
+                try:
+                    render()
+                except Exception:
+                    logger.warning("Не удалось сформировать вложение %s", type(self).__name__, exc_info=True)
+                else:
+                    flushed += 1
+            renders.clear()
+
+    def discard(self) -> None:
+        """Удаляет отложенные вложения без формирования."""
+        self._pending.clear()
+
+    @classmethod
+    def flush_all(cls) -> int:
+        """Выгружает буферы всех обработчиков.
+
+        Returns:
+            Число прикрепленных вложений.
+        """
+        with cls._instances_lock:
+            handlers = list(cls._instances)
+
+        return sum(handler.flush() for handler in handlers)
+
+    @classmethod
+    def discard_all(cls) -> None:
+        """Очищает буферы всех обработчиков."""
+        with cls._instances_lock:
+            handlers = list(cls._instances)
+
+        for handler in handlers:
+            handler.discard()
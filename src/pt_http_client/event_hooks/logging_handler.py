@@ -1,49 +1,152 @@
-import json
 import logging
+from functools import partial
 
 import httpx
 
+from ..body import BodyCapture
 from .abstract_hook_handler import AbstractHookHandler
+from .snapshots import RequestSnapshot, ResponseSnapshot
 
 
 class LoggingHandler(AbstractHookHandler):
-    """Простой обработчик для логирования HTTP запросов."""
+    """Простой обработчик для логирования HTTP запросов.
 
-    def __init__(self, logger: logging.Logger | None = None) -> None:
+    Подробности ответа пишутся в лог после того, как вызывающий код прочитает
+    тело, поэтому потоковые ответы не загружаются в память целиком.
+    """
+
+    streaming_safe = True
+
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        log_body: bool = True,
+        body_log_level: int = logging.DEBUG,
+        max_body_length: int = AbstractHookHandler.MAX_BODY_LENGTH,
+    ) -> None:
         """Инициализирует обработчик логирования.
 
         Args:
             logger: Логгер для записи сообщений. Если не передан,
                     используется логгер с именем текущего модуля.
+            log_body: Логировать подробности ответа с телом. Если False, тело
+                    не читается и не разбирается, в лог пишется только статус.
+            body_log_level: Уровень логирования подробностей успешного ответа.
+            max_body_length: Максимальная длина тела ответа в логе, в символах.
         """
         self.logger = logger or logging.getLogger(__name__)
+        self.log_body = log_body
+        self.body_log_level = body_log_level
+        self.max_body_length = max_body_length
 
     def request_hook(self, request: httpx.Request) -> None:
         """Хук для логирования запроса."""
-        self.logger.info(f"Запрос: {request.method} {request.url}")
-        self.logger.debug(f"Параметры: {dict(request.url.params)}")
+        self._log_request(request.method, request.url)
+
+    def request_snapshot_hook(self, request: RequestSnapshot) -> None:
+        """Хук для логирования снимка запроса."""
+        self._log_request(request.method, request.url)
+
+    def _log_request(self, method: str, url: httpx.URL) -> None:
+        """Логирует запрос.
+
+        Args:
+            method: HTTP метод
+            url: URL запроса
+        """
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Запрос: %s %s", method, url)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Параметры: %s", dict(url.params))
 
     def response_hook(self, response: httpx.Response) -> None:
-        """Хук для логирования ответа."""
-        response.read()
+        """Хук для логирования ответа.
+
+        Тело ответа собирается и разбирается, только если подробности ответа
+        будут записаны в лог при текущем уровне логгера.
+        """
+        status_level, details_level = self._levels(response.status_code)
+        if self._log_status(response.status_code, response.request.method, response.url, status_level, details_level):
+            return
+
+        self._watch_response_body(response, partial(self._on_response_body, response, status_level, details_level))
+
+    def response_snapshot_hook(self, response: ResponseSnapshot) -> None:
+        """Хук для логирования снимка ответа, поток которого уже закрыт."""
+        status_level, details_level = self._levels(response.status_code)
+        if self._log_status(response.status_code, response.method, response.url, status_level, details_level):
+            return
+
+        self._log_response(response, status_level, details_level)
 
-        try:
-            body = response.json()
-        except json.JSONDecodeError:
-            body = response.text
+    def _levels(self, status_code: int) -> tuple[int, int]:
+        """Определяет уровни логирования ответа.
+
+        Args:
+            status_code: Код ответа
+
+        Returns:
+            Уровень строки со статусом и уровень подробностей ответа с телом.
+        """
+        if status_code >= httpx.codes.BAD_REQUEST:
+            return logging.WARNING, logging.WARNING
+        return logging.INFO, self.body_log_level
 
+    def _log_status(self, status_code: int, method: str, url: httpx.URL, status_level: int, details_level: int) -> bool:
+        """Логирует только статус ответа, если подробности не нужны.
+
+        Args:
+            status_code: Код ответа
+            method: HTTP метод запроса
+            url: URL ответа
+            status_level: Уровень строки со статусом ответа
+            details_level: Уровень подробностей ответа с телом
+
+        Returns:
+            True, если подробности ответа логировать не нужно.
+        """
+        if not self.log_body:
+            if self.logger.isEnabledFor(status_level):
+                self.logger.log(status_level, "Ответ: %s %s %s", status_code, method, url)
+            return True
+
+        if not self.logger.isEnabledFor(details_level):
+            if self.logger.isEnabledFor(status_level):
+                self.logger.log(status_level, "Ответ: %s", status_code)
+            return True
+
+        return False
+
+    def _on_response_body(
+        self, response: httpx.Response, status_level: int, details_level: int, capture: BodyCapture
+    ) -> None:
+        """Логирует ответ после закрытия потока.
+
+        Args:
+            response: Объект ответа httpx.
+            status_level: Уровень строки со статусом ответа
+            details_level: Уровень подробностей ответа с телом
+            capture: Начало тела ответа, собранное при чтении потока
+        """
+        self._log_response(ResponseSnapshot.from_response(response, capture), status_level, details_level)
+
+    def _log_response(self, response: ResponseSnapshot, status_level: int, details_level: int) -> None:
+        """Логирует ответ с телом.
+
+        Args:
+            response: Снимок ответа
+            status_level: Уровень строки со статусом ответа
+            details_level: Уровень подробностей ответа с телом
+        """
         response_info = {
-            "method": response.request.method,
-            "url": response.request.url,
+            "method": response.method,
+            "url": response.url,
             "status_code": response.status_code,
-            "elapsed_seconds": response.elapsed.total_seconds(),
-            "body": self._truncate_body(body) if body else None,
+            "elapsed_seconds": response.elapsed_seconds,
+            "size": response.body.size,
+            "headers": dict(response.headers),
+            "body": self._body_preview(response.body),
         }
 
-        if response.status_code >= httpx.codes.BAD_REQUEST:
-            self.logger.warning(f"Ответ: {response.status_code}")
-            self.logger.warning(response_info)
-
-        else:
-            self.logger.info(f"Ответ: {response.status_code}")
-            self.logger.debug(response_info)
+        self.logger.log(status_level, "Ответ: %s", response.status_code)
+        self.logger.log(details_level, response_info)
@@ -0,0 +1,105 @@
+"""Профили наборов обработчиков событий по умолчанию.
+
+Модули обработчиков импортируются внутри фабрик, поэтому импорт пакета не
+тянет allure и curlify2, а профиль production не загружает их вовсе.
+"""
+
+import logging
+from collections.abc import Callable
+
+from .abstract_hook_handler import AbstractHookHandler
+
+type HandlerFactory = Callable[[], list[AbstractHookHandler]]
+
+DEFAULT_PROFILE = "test"
+
+
+def production_handlers() -> list[AbstractHookHandler]:
+    """Дешевый набор для production: только строка статуса в лог, без чтения тела.
+
+    Returns:
+        Обработчик LoggingHandler без логирования тел ответов.
+    """
+    from .logging_handler import LoggingHandler  # noqa: PLC0415
+
+    return [LoggingHandler(log_body=False)]
+
+
+def test_handlers() -> list[AbstractHookHandler]:
+    """Набор для автотестов: вложения Allure, cURL команды и лог.
+
+    Returns:
+        Обработчики AllureHandler, CurlHandler и LoggingHandler.
+    """
+    from .allure_handler import AllureHandler  # noqa: PLC0415
+    from .curl_handler import CurlHandler  # noqa: PLC0415
+    from .logging_handler import LoggingHandler  # noqa: PLC0415
+
+    return [AllureHandler(), CurlHandler(), LoggingHandler()]
+
+
+def debug_handlers() -> list[AbstractHookHandler]:
+    """Набор для отладки: как test, но тела ответов пишутся в лог на уровне INFO.
+
+    Returns:
+        Обработчики AllureHandler, CurlHandler и LoggingHandler.
+    """
+    from .allure_handler import AllureHandler  # noqa: PLC0415
+    from .curl_handler import CurlHandler  # noqa: PLC0415
+    from .logging_handler import LoggingHandler  # noqa: PLC0415
+
+    return [AllureHandler(), CurlHandler(), LoggingHandler(body_log_level=logging.INFO)]
+
+
+def failures_handlers() -> list[AbstractHookHandler]:
+    """Набор для больших прогонов: вложения Allure и cURL только при ошибке.
+
+    Последние обмены хранятся в буфере и прикрепляются к отчету, если ответ
+    завершился ошибкой или тест упал, см. DeferredAttachmentHandler.
+
+    Returns:
+        Обработчики AllureHandler, CurlHandler в режиме failures_only и LoggingHandler.
+    """
+    from .allure_handler import AllureHandler  # noqa: PLC0415
+    from .curl_handler import CurlHandler  # noqa: PLC0415
+    from .logging_handler import LoggingHandler  # noqa: PLC0415
+
+    return [AllureHandler(failures_only=True), CurlHandler(failures_only=True), LoggingHandler()]
+
+
+PROFILES: dict[str, HandlerFactory] = {
+    "production": production_handlers,
+    "test": test_handlers,
+    "debug": debug_handlers,
+    "failures": failures_handlers,
+}
+
+
+def register_profile(name: str, factory: HandlerFactory) -> None:
+    """Регистрирует профиль обработчиков или заменяет существующий.
+
+    Args:
+        name: Имя профиля для параметра profile клиента
+        factory: Функция, создающая новый список обработчиков
+    """
+    PROFILES[name] = factory
+
+
+def build_handlers(profile: str = DEFAULT_PROFILE) -> list[AbstractHookHandler]:
+    """Создает обработчики профиля.
+
+    Args:
+        profile: Имя профиля: production, test, debug, failures или зарегистрированное через register_profile
+
+    Returns:
+        Новый список обработчиков.
+
+    Raises:
+        ValueError: Если профиль не зарегистрирован.
+    """
+    try:
+        factory = PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Неизвестный профиль обработчиков: {profile}. Доступны: {', '.join(PROFILES)}") from None
+
+    return factory()
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+import httpx
+
+from ..body import BodyCapture, BodySnapshot
+from ..codec import _CODEC_KEY, JsonCodec, codec_for
+
+
+@dataclass(frozen=True, slots=True)
+class RequestSnapshot:
+    """Данные запроса для обработчика без ссылки на сам запрос.
+
+    Снимок не меняется вместе с запросом (например, при повторе после 401
+    с новым заголовком Authorization) и хранит только начало тела, поэтому
+    его можно отложить в буфер или передать в другой поток.
+
+    Атрибуты:
+        method: HTTP метод
+        url: URL запроса
+        headers: Копия заголовков запроса
+        content: Начало тела запроса длиной до лимита
+        size: Полная длина тела запроса в байтах
+        codec: Кодек JSON клиента
+        exchange: request.extensions исходного запроса, общий для снимков одного обмена
+    """
+
+    method: str
+    url: httpx.URL
+    headers: httpx.Headers
+    content: bytes
+    size: int
+    codec: JsonCodec
+    exchange: dict[str, Any]
+
+    @classmethod
+    def from_request(cls, request: httpx.Request, limit: int | None = None) -> RequestSnapshot:
+        """Копирует данные запроса.
+
+        Args:
+            request: Объект запроса httpx.
+            limit: Сколько байт начала тела сохранить, None - все тело
+
+        Returns:
+            Снимок запроса.
+        """
+        try:
+            content = request.content
+        except httpx.RequestNotRead:
+            content = b""
+
+        return cls(
+            method=request.method,
+            url=request.url,
+            headers=request.headers.copy(),
+            content=content if limit is None else content[:limit],
+            size=len(content),
+            codec=codec_for(request),
+            exchange=request.extensions,
+        )
+
+    @property
+    def truncated(self) -> bool:
+        """Тело запроса сохранено не полностью."""
+        return self.size > len(self.content)
+
+    def to_request(self) -> httpx.Request:
+        """Восстанавливает запрос httpx с сохраненным началом тела.
+
+        Returns:
+            Новый объект запроса.
+        """
+        return httpx.Request(
+            self.method, self.url, headers=self.headers, content=self.content, extensions={_CODEC_KEY: self.codec}
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class ResponseSnapshot:
+    """Данные ответа для обработчика без ссылки на сам ответ.
+
+    Атрибуты:
+        method: HTTP метод запроса
+        url: URL ответа
+        status_code: Код ответа
+        elapsed_seconds: Время выполнения запроса в секундах
+        headers: Копия заголовков ответа
+        body: Начало тела ответа или его снимок
+        codec: Кодек JSON клиента
+        exchange: request.extensions исходного запроса, общий для снимков одного обмена
+    """
+
+    method: str
+    url: httpx.URL
+    status_code: int
+    elapsed_seconds: float
+    headers: httpx.Headers
+    body: BodyCapture | BodySnapshot
+    codec: JsonCodec
+    exchange: dict[str, Any]
+
+    @classmethod
+    def from_response(cls, response: httpx.Response, body: BodyCapture | BodySnapshot) -> ResponseSnapshot:
+        """Копирует данные ответа, поток которого уже закрыт.
+
+        Args:
+            response: Объект ответа httpx.
+            body: Начало тела ответа. BodyCapture ссылается на ответ, поэтому
+                для буферов и других потоков передается BodyCapture.snapshot
+
+        Returns:
+            Снимок ответа.
+        """
+        try:
+            elapsed_seconds = response.elapsed.total_seconds()
+        except RuntimeError:
+            # Транспорт вернул уже прочитанный ответ (например, MockTransport), время httpx не засекает
+            elapsed_seconds = 0.0
+
+        return cls(
+            method=response.request.method,
+            url=response.url,
+            status_code=response.status_code,
+            elapsed_seconds=elapsed_seconds,
+            headers=response.headers.copy(),
+            body=body,
+            codec=codec_for(response),
+            exchange=response.request.extensions,
+        )
+
+    def to_response(self) -> httpx.Response:
+        """Восстанавливает прочитанный ответ httpx с сохраненным началом тела.
+
+        Тело уже распаковано, поэтому заголовок Content-Encoding удаляется.
+
+        Returns:
+            Новый объект ответа.
+        """
+        headers = self.headers.copy()
+        headers.pop("content-encoding", None)
+        request = httpx.Request(self.method, self.url, extensions={_CODEC_KEY: self.codec})
+        content = self.body.content_prefix(self.body.size) or b""
+
+        response = httpx.Response(self.status_code, headers=headers, content=content, request=request)
+        response.elapsed = timedelta(seconds=self.elapsed_seconds)
+        return response
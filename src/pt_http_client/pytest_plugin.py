@@ -0,0 +1,40 @@
+"""Плагин pytest для отложенных вложений обработчиков.
+
+Подключается автоматически через entry point pytest11. Перед каждым тестом
+очищает буферы DeferredAttachmentHandler, после каждой фазы теста выгружает
+очереди BackgroundHandler, а при падении любой фазы теста прикрепляет
+отложенные вложения к отчету этого теста.
+"""
+
+from collections.abc import Generator
+
+import pytest
+
+from .event_hooks.background_handler import BackgroundHandler
+from .event_hooks.deferred_handler import DeferredAttachmentHandler
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item: pytest.Item) -> None:
+    """Очищает буферы, чтобы в отчет попали только обмены текущего теста."""
+    DeferredAttachmentHandler.discard_all()
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(
+    item: pytest.Item, call: pytest.CallInfo[None]
+) -> Generator[None, pytest.TestReport, pytest.TestReport]:
+    """Выгружает фоновые очереди и прикрепляет отложенные вложения при ошибке.
+
+    Yields:
+        Управление остальным реализациям хука.
+
+    Returns:
+        Отчет о фазе теста без изменений.
+    """
+    report = yield
+    BackgroundHandler.flush_all()
+    if report.failed:
+        DeferredAttachmentHandler.flush_all()
+
+    return report
@@ -0,0 +1,16 @@
+from collections.abc import Iterator
+
+import pytest
+
+from pt_http_client import BearerTokenAuth
+
+pytest_plugins = ["pytester"]
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache() -> Iterator[None]:
+    """Очищает общий кеш токенов между тестами."""
+    BearerTokenAuth._token_cache.clear()
+    BearerTokenAuth._coalesced_fetches = 0
+    yield
+    BearerTokenAuth._token_cache.clear()
@@ -0,0 +1,82 @@
+import threading
+import time
+from typing import Any
+from urllib.parse import parse_qs
+
+import httpx
+
+from pt_http_client import BearerTokenAuth
+
+
+class TokenServer:
+    """Поддельный эндпоинт токена, считающий обращения."""
+
+    def __init__(
+        self,
+        expires_in: int | None = None,
+        delay: float = 0.0,
+        issue_refresh_token: bool = False,
+        reject_refresh_token: bool = False,
+    ) -> None:
+        """Инициализирует эндпоинт."""
+        self.expires_in = expires_in
+        self.delay = delay
+        self.issue_refresh_token = issue_refresh_token
+        self.reject_refresh_token = reject_refresh_token
+        self.calls = 0
+        self.grants: list[str] = []
+        self.issued: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        """Выдает новый токен на каждый вызов.
+
+        Returns:
+            Ответ эндпоинта с новым токеном.
+        """
+        form = parse_qs(request.content.decode())
+        grant_type = form["grant_type"][0]
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+            self.grants.append(grant_type)
+        time.sleep(self.delay)
+
+        if grant_type == "refresh_token" and self.reject_refresh_token:
+            return httpx.Response(httpx.codes.BAD_REQUEST, json={"error": "invalid_grant"})
+
+        token_data: dict[str, Any] = {"access_token": f"token-{calls}"}
+        self.issued[token_data["access_token"]] = form.get("username", [""])[0]
+        if self.expires_in is not None:
+            token_data["expires_in"] = self.expires_in
+        if self.issue_refresh_token:
+            token_data["refresh_token"] = f"refresh-{calls}"
+        return httpx.Response(httpx.codes.OK, json=token_data)
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        """Транспорт httpx, направляющий запросы в этот эндпоинт."""
+        return httpx.MockTransport(self)
+
+
+TOKEN_URL = "https://auth.example.com/token"
+
+
+def make_auth(server: TokenServer, **kwargs: Any) -> BearerTokenAuth:
+    """Создает BearerTokenAuth, получающий токены у поддельного эндпоинта.
+
+    Returns:
+        Объект аутентификации администратора.
+    """
+    options: dict[str, Any] = {
+        "token_url": TOKEN_URL,
+        "client_id": "client",
+        "client_secret": "secret",
+        "username": "admin",
+        "password": "admin-password",
+        "scope": "api",
+        "response_type": "token",
+        "grant_type": "password",
+        "transport": server.transport,
+    }
+    return BearerTokenAuth(**options | kwargs)
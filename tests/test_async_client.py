@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+import httpx
+from helpers import TokenServer, make_auth
+
+from pt_http_client import AsyncHttpClient
+from pt_http_client.event_hooks.abstract_hook_handler import AbstractHookHandler
+
+
+class RecordingHandler(AbstractHookHandler):
+    """Обработчик, запоминающий вызовы хуков."""
+
+    def __init__(self) -> None:
+        """Инициализирует списки вызовов."""
+        self.requests: list[str] = []
+        self.responses: list[int] = []
+
+    def request_hook(self, request: httpx.Request) -> None:
+        """Запоминает путь запроса."""
+        self.requests.append(request.url.path)
+
+    def response_hook(self, response: httpx.Response) -> None:
+        """Запоминает код ответа."""
+        self.responses.append(response.status_code)
+
+
+class TestAsyncHttpClient:
+    """Тесты для AsyncHttpClient."""
+
+    BASE_URL = "https://api.example.com"
+    REQUESTS_COUNT = 50
+    USERS_COUNT = 5
+    TOKEN_DELAY = 0.2
+
+    @staticmethod
+    def _echo(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(httpx.codes.OK, json={"method": request.method, "path": request.url.path})
+
+    def test_concurrent_requests(self) -> None:
+        """Позитивный: параллельные запросы через один клиент."""
+        handler = RecordingHandler()
+
+        async def run() -> list[httpx.Response]:
+            async with AsyncHttpClient(
+                base_url=self.BASE_URL, handlers=[handler], transport=httpx.MockTransport(self._echo)
+            ) as client:
+                responses: list[httpx.Response] = await asyncio.gather(
+                    *(client.get(f"/posts/{i}") for i in range(self.REQUESTS_COUNT))
+                )
+                return responses
+
+        responses = asyncio.run(run())
+
+        assert [response.json()["path"] for response in responses] == [
+            f"/posts/{i}" for i in range(self.REQUESTS_COUNT)
+        ]
+        assert len(handler.requests) == self.REQUESTS_COUNT
+        assert handler.responses == [httpx.codes.OK] * self.REQUESTS_COUNT
+
+    def test_verbs_and_close(self) -> None:
+        """Позитивный: все HTTP методы и закрытие клиента."""
+
+        async def run() -> list[str]:
+            client = AsyncHttpClient(
+                base_url=self.BASE_URL, handlers=[RecordingHandler()], transport=httpx.MockTransport(self._echo)
+            )
+            try:
+                responses = [
+                    await client.get("/items"),
+                    await client.post("/items", json={"name": "item"}),
+                    await client.put("/items/1", json={"name": "item"}),
+                    await client.patch("/items/1", json={"name": "item"}),
+                    await client.delete("/items/1"),
+                ]
+            finally:
+                await client.aclose()
+
+            assert client._client is None
+            return [response.json()["method"] for response in responses]
+
+        assert asyncio.run(run()) == ["GET", "POST", "PUT", "PATCH", "DELETE"]
+
+    def test_per_request_user(self) -> None:
+        """Позитивный: параллельные задачи выполняют запросы от разных пользователей."""
+        server = TokenServer()
+        auth = make_auth(server)
+        seen: list[tuple[str, str]] = []
+
+        def api(request: httpx.Request) -> httpx.Response:
+            token = request.headers["Authorization"].removeprefix("Bearer ")
+            seen.append((request.url.params["user"], server.issued[token]))
+            return httpx.Response(httpx.codes.OK)
+
+        async def run() -> None:
+            async with AsyncHttpClient(
+                base_url=self.BASE_URL, auth=auth, handlers=[RecordingHandler()], transport=httpx.MockTransport(api)
+            ) as client:
+                await asyncio.gather(
+                    *(
+                        client.get("/whoami", params={"user": f"user{i}"}, user=(f"user{i}", "password"))
+                        for i in range(self.REQUESTS_COUNT)
+                    )
+                )
+
+        asyncio.run(run())
+
+        assert len(seen) == self.REQUESTS_COUNT
+        assert all(expected == actual for expected, actual in seen)
+
+    def test_concurrent_logins_do_not_block_loop(self) -> None:
+        """Позитивный: логины разных пользователей идут параллельно, а одного пользователя объединяются."""
+        server = TokenServer(delay=self.TOKEN_DELAY)
+        auth = make_auth(server)
+
+        async def run() -> float:
+            async with AsyncHttpClient(
+                base_url=self.BASE_URL,
+                auth=auth,
+                handlers=[RecordingHandler()],
+                transport=httpx.MockTransport(self._echo),
+            ) as client:
+                started = time.perf_counter()
+                await asyncio.gather(
+                    *(
+                        client.get("/whoami", user=(f"user{i % self.USERS_COUNT}", "password"))
+                        for i in range(self.USERS_COUNT * 2)
+                    )
+                )
+                return time.perf_counter() - started
+
+        elapsed = asyncio.run(run())
+
+        assert server.calls == self.USERS_COUNT
+        assert elapsed < self.TOKEN_DELAY * self.USERS_COUNT / 2
+
+    def test_stream(self) -> None:
+        """Позитивный: потоковое чтение ответа асинхронным клиентом."""
+        handler = RecordingHandler()
+
+        async def run() -> list[str]:
+            async with AsyncHttpClient(
+                base_url=self.BASE_URL, handlers=[handler], transport=httpx.MockTransport(self._echo)
+            ) as client:
+                async with client.stream("GET", "/export") as response:
+                    return [line async for line in response.aiter_lines()]
+
+        lines = asyncio.run(run())
+
+        assert lines == ['{"method":"GET","path":"/export"}']
+        assert handler.requests == ["/export"]
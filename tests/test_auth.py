@@ -0,0 +1,558 @@
+import base64
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+from helpers import TOKEN_URL, TokenServer, make_auth
+from tenacity import retry, retry_if_exception_type, stop_after_attempt
+
+from pt_http_client import BearerTokenAuth, HttpClient, RequestSpec
+from pt_http_client.auth import bearer, token_cache
+from pt_http_client.auth.token_cache import (
+    CachedToken,
+    MemoryTokenStore,
+    SqliteTokenStore,
+    TokenCacheStats,
+    jwt_expiry,
+)
+from pt_http_client.event_hooks.curl_handler import CurlHandler
+
+
+class TestBearerTokenAuth:
+    """Тесты для BearerTokenAuth."""
+
+    EXPIRES_IN = 300
+    REFRESH_SKEW = 30.0
+    NOW = 1_000_000.0
+    TWO_CALLS = 2
+    THREADS = 20
+
+    def test_token_reused_until_refresh_skew(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Позитивный: токен берется из кеша до наступления refresh_skew."""
+        server = TokenServer(expires_in=self.EXPIRES_IN)
+        monkeypatch.setattr(token_cache.time, "time", lambda: self.NOW)
+        auth = make_auth(server, refresh_skew=self.REFRESH_SKEW)
+
+        assert auth._fetch_token() == "token-1"
+
+        monkeypatch.setattr(token_cache.time, "time", lambda: self.NOW + self.EXPIRES_IN - self.REFRESH_SKEW - 1)
+        assert auth._fetch_token() == "token-1"
+        assert server.calls == 1
+
+        monkeypatch.setattr(token_cache.time, "time", lambda: self.NOW + self.EXPIRES_IN - self.REFRESH_SKEW)
+        assert auth._fetch_token() == "token-2"
+        assert server.calls == self.TWO_CALLS
+
+    def test_token_without_expires_in_never_expires(self) -> None:
+        """Позитивный: без expires_in токен кешируется бессрочно."""
+        server = TokenServer()
+        auth = make_auth(server, refresh_skew=self.REFRESH_SKEW)
+
+        assert auth._fetch_token() == auth._fetch_token() == "token-1"
+        assert server.calls == 1
+
+    def test_concurrent_misses_fetch_token_once(self) -> None:
+        """Позитивный: одновременные промахи кеша приводят к одному запросу токена."""
+        server = TokenServer(delay=0.05)
+        auth = make_auth(server, refresh_skew=self.REFRESH_SKEW)
+        barrier = threading.Barrier(self.THREADS)
+
+        def fetch() -> str:
+            barrier.wait()
+            token: str = auth._fetch_token()
+            return token
+
+        with ThreadPoolExecutor(max_workers=self.THREADS) as executor:
+            tokens = list(executor.map(lambda _: fetch(), range(self.THREADS)))
+
+        assert set(tokens) == {"token-1"}
+        assert server.calls == 1
+        assert BearerTokenAuth.coalesced_fetches() == self.THREADS - 1
+        assert auth.cache_stats() == TokenCacheStats(misses=self.THREADS, size=1)
+
+    def test_cache_stats_count_each_fetch_once(self) -> None:
+        """Позитивный: каждое получение токена учитывается в статистике своего хранилища один раз."""
+        store = MemoryTokenStore()
+        auth = make_auth(TokenServer(), token_store=store)
+
+        auth._fetch_token()
+        assert auth.cache_stats() == TokenCacheStats(misses=1, size=1)
+
+        auth._fetch_token()
+        assert auth.cache_stats() == TokenCacheStats(hits=1, misses=1, size=1)
+        assert make_auth(TokenServer()).cache_stats() == TokenCacheStats()
+
+    def test_token_client_is_reused_and_retried(self) -> None:
+        """Позитивный: запросы токена идут через один клиент и повторяются retry декоратором."""
+        server = TokenServer()
+        failures = [httpx.codes.SERVICE_UNAVAILABLE]
+
+        def flaky(request: httpx.Request) -> httpx.Response:
+            if failures:
+                return httpx.Response(failures.pop())
+            return server(request)
+
+        auth = make_auth(
+            server,
+            transport=httpx.MockTransport(flaky),
+            retry=retry(stop=stop_after_attempt(self.TWO_CALLS), retry=retry_if_exception_type(httpx.HTTPStatusError)),
+        )
+        client = auth._setup_token_client()
+
+        assert auth._fetch_token() == "token-1"
+        assert auth._setup_token_client() is client
+
+        auth.close()
+        assert auth._token_client is None
+
+    def test_unauthorized_response_refreshes_token_and_replays(self) -> None:
+        """Позитивный: на 401 токен обновляется, а запрос повторяется один раз."""
+        server = TokenServer()
+        auth = make_auth(server, refresh_skew=self.REFRESH_SKEW)
+        seen_tokens: list[str] = []
+
+        def api(request: httpx.Request) -> httpx.Response:
+            seen_tokens.append(request.headers["Authorization"])
+            if request.headers["Authorization"] == "Bearer token-1":
+                return httpx.Response(httpx.codes.UNAUTHORIZED)
+            return httpx.Response(httpx.codes.OK, json={"ok": True})
+
+        with HttpClient(
+            base_url="https://api.example.com", auth=auth, handlers=[CurlHandler()], transport=httpx.MockTransport(api)
+        ) as client:
+            response = client.post("/items", json={"name": "item"})
+            assert response.status_code == httpx.codes.OK
+            assert client.get("/items").status_code == httpx.codes.OK
+
+        assert seen_tokens == ["Bearer token-1", "Bearer token-2", "Bearer token-2"]
+        assert server.calls == self.TWO_CALLS
+
+    def test_persistent_unauthorized_is_returned(self) -> None:
+        """Негативный: повторный 401 возвращается вызывающему без новых попыток."""
+        server = TokenServer()
+        auth = make_auth(server, refresh_skew=self.REFRESH_SKEW)
+
+        def api(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(httpx.codes.UNAUTHORIZED)
+
+        with HttpClient(
+            base_url="https://api.example.com", auth=auth, handlers=[CurlHandler()], transport=httpx.MockTransport(api)
+        ) as client:
+            assert client.get("/items").status_code == httpx.codes.UNAUTHORIZED
+
+        assert server.calls == self.TWO_CALLS
+
+    def test_unauthorized_is_returned_without_reauth(self) -> None:
+        """Негативный: с reauth_on_401=False ответ 401 возвращается без нового входа и повтора."""
+        server = TokenServer()
+        auth = make_auth(server, reauth_on_401=False)
+        seen_tokens: list[str] = []
+
+        def api(request: httpx.Request) -> httpx.Response:
+            seen_tokens.append(request.headers["Authorization"])
+            return httpx.Response(httpx.codes.UNAUTHORIZED)
+
+        with HttpClient(
+            base_url="https://api.example.com", auth=auth, handlers=[CurlHandler()], transport=httpx.MockTransport(api)
+        ) as client:
+            assert client.get("/admin").status_code == httpx.codes.UNAUTHORIZED
+            assert client.get("/admin").status_code == httpx.codes.UNAUTHORIZED
+
+        assert seen_tokens == ["Bearer token-1", "Bearer token-1"]
+        assert server.calls == 1
+
+    def test_expired_token_renewed_with_refresh_token(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Позитивный: истекший токен обновляется через refresh_token без входа по паролю."""
+        server = TokenServer(expires_in=self.EXPIRES_IN, issue_refresh_token=True)
+        auth = make_auth(server, refresh_skew=self.REFRESH_SKEW)
+        monkeypatch.setattr(token_cache.time, "time", lambda: self.NOW)
+        assert auth._fetch_token() == "token-1"
+
+        monkeypatch.setattr(token_cache.time, "time", lambda: self.NOW + self.EXPIRES_IN)
+        assert auth._fetch_token() == "token-2"
+        assert server.grants == ["password", "refresh_token"]
+
+    def test_rejected_refresh_token_falls_back_to_password(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Негативный: при отказе в refresh_token выполняется вход по паролю."""
+        server = TokenServer(expires_in=self.EXPIRES_IN, issue_refresh_token=True, reject_refresh_token=True)
+        auth = make_auth(server, refresh_skew=self.REFRESH_SKEW)
+        monkeypatch.setattr(token_cache.time, "time", lambda: self.NOW)
+        auth._fetch_token()
+
+        monkeypatch.setattr(token_cache.time, "time", lambda: self.NOW + self.EXPIRES_IN)
+        assert auth._fetch_token() == "token-3"
+        assert server.grants == ["password", "refresh_token", "password"]
+
+    def test_switch_to_user_is_isolated_per_thread(self) -> None:
+        """Позитивный: потоки работают от разных пользователей через один клиент."""
+        server = TokenServer()
+        auth = make_auth(server)
+        seen: list[tuple[str, str]] = []
+        barrier = threading.Barrier(self.THREADS)
+
+        def api(request: httpx.Request) -> httpx.Response:
+            token = request.headers["Authorization"].removeprefix("Bearer ")
+            seen.append((request.url.params["user"], server.issued[token]))
+            return httpx.Response(httpx.codes.OK)
+
+        with HttpClient(
+            base_url="https://api.example.com", auth=auth, handlers=[CurlHandler()], transport=httpx.MockTransport(api)
+        ) as client:
+
+            def call_as(user: str) -> None:
+                with auth.switch_to_user(user, f"{user}-password"):
+                    barrier.wait()
+                    client.get("/whoami", params={"user": user})
+
+            with ThreadPoolExecutor(max_workers=self.THREADS) as executor:
+                list(executor.map(call_as, [f"user{i}" for i in range(self.THREADS)]))
+
+            client.get("/whoami", params={"user": "admin"})
+
+        assert len(seen) == self.THREADS + 1
+        assert all(expected == actual for expected, actual in seen)
+        assert auth.username == "admin"
+
+    def test_switch_to_user_is_scoped_per_instance(self) -> None:
+        """Позитивный: вложенные переключения разных объектов не влияют друг на друга."""
+        server = TokenServer()
+        first, second = make_auth(server), make_auth(server)
+
+        with first.switch_to_user("user1", "password"):
+            with second.switch_to_user("user2", "password"), first.switch_to_user("user3", "password"):
+                assert (first.username, second.username) == ("user3", "user2")
+            assert (first.username, second.username) == ("user1", "admin")
+
+        assert first.username == second.username == "admin"
+
+    def test_batch_runs_as_switched_user(self) -> None:
+        """Позитивный: запросы batch выполняются от пользователя вызывающего потока."""
+        server = TokenServer()
+        auth = make_auth(server)
+        users: list[str] = []
+
+        def api(request: httpx.Request) -> httpx.Response:
+            users.append(server.issued[request.headers["Authorization"].removeprefix("Bearer ")])
+            return httpx.Response(httpx.codes.OK)
+
+        with HttpClient(
+            base_url="https://api.example.com", auth=auth, handlers=[CurlHandler()], transport=httpx.MockTransport(api)
+        ) as client:
+            with auth.switch_to_user("user1", "user1-password"):
+                client.batch([RequestSpec("GET", f"/items/{i}") for i in range(self.THREADS)], max_workers=4)
+
+        assert set(users) == {"user1"}
+
+    def test_per_request_user_through_one_client(self) -> None:
+        """Позитивный: параметр user выполняет запрос от указанного пользователя."""
+        server = TokenServer()
+        auth = make_auth(server)
+        seen: list[tuple[str, str]] = []
+
+        def api(request: httpx.Request) -> httpx.Response:
+            token = request.headers["Authorization"].removeprefix("Bearer ")
+            seen.append((request.url.params["user"], server.issued[token]))
+            return httpx.Response(httpx.codes.OK)
+
+        users = [(f"user{i}", f"user{i}-password") for i in range(self.THREADS)]
+        with HttpClient(
+            base_url="https://api.example.com", auth=auth, handlers=[CurlHandler()], transport=httpx.MockTransport(api)
+        ) as client:
+            client.batch(
+                [RequestSpec("GET", "/whoami", params={"user": user[0]}, user=user) for user in users], max_workers=8
+            )
+            client.get("/whoami", params={"user": "user1"}, user=users[1])
+
+        assert len(seen) == self.THREADS + 1
+        assert all(expected == actual for expected, actual in seen)
+        assert server.calls == self.THREADS
+
+    def test_per_request_user_requires_bearer_auth(self) -> None:
+        """Негативный: параметр user без BearerTokenAuth приводит к TypeError."""
+        with HttpClient(
+            base_url="https://api.example.com",
+            handlers=[CurlHandler()],
+            transport=httpx.MockTransport(lambda request: httpx.Response(httpx.codes.OK)),
+        ) as client:
+            with pytest.raises(TypeError):
+                client.get("/whoami", user=("user1", "user1-password"))
+
+    def test_prewarm_fetches_tokens_concurrently(self) -> None:
+        """Позитивный: prewarm получает токены всех пользователей параллельно."""
+        server = TokenServer(delay=0.05)
+        auth = make_auth(server)
+        users = [(f"user{i}", f"user{i}-password") for i in range(self.THREADS)]
+
+        started = time.monotonic()
+        auth.prewarm(users, max_workers=self.THREADS)
+        elapsed = time.monotonic() - started
+
+        assert server.calls == self.THREADS
+        assert elapsed < server.delay * self.THREADS / 2
+        for user in users:
+            with auth.switch_to_user(*user):
+                auth._fetch_token()
+        assert server.calls == self.THREADS
+
+    def test_prewarm_raises_login_error(self) -> None:
+        """Негативный: ошибка входа пользователя пробрасывается из prewarm."""
+        auth = make_auth(
+            TokenServer(), transport=httpx.MockTransport(lambda request: httpx.Response(httpx.codes.UNAUTHORIZED))
+        )
+
+        with pytest.raises(httpx.HTTPStatusError):
+            auth.prewarm([("user1", "wrong-password")])
+
+    def test_refresh_expiring_renews_tokens_ahead_of_skew(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Позитивный: refresh_expiring обновляет только токены, близкие к истечению."""
+        server = TokenServer(expires_in=self.EXPIRES_IN)
+        auth = make_auth(server, refresh_skew=self.REFRESH_SKEW)
+        monkeypatch.setattr(token_cache.time, "time", lambda: self.NOW)
+        monkeypatch.setattr(bearer.time, "time", lambda: self.NOW)
+        auth.prewarm([("user1", "password"), ("user2", "password")])
+
+        assert auth.refresh_expiring(refresh_ahead=self.REFRESH_SKEW) == 0
+
+        later = self.NOW + self.EXPIRES_IN - 2 * self.REFRESH_SKEW
+        monkeypatch.setattr(token_cache.time, "time", lambda: later)
+        monkeypatch.setattr(bearer.time, "time", lambda: later)
+        assert auth.refresh_expiring(refresh_ahead=self.REFRESH_SKEW) == self.TWO_CALLS
+        assert server.calls == 2 * self.TWO_CALLS
+
+        with auth.switch_to_user("user1", "password"):
+            assert auth._fetch_token() in {"token-3", "token-4"}
+        assert server.calls == 2 * self.TWO_CALLS
+        assert auth.cache_stats() == TokenCacheStats(hits=1, misses=self.TWO_CALLS, size=self.TWO_CALLS)
+
+    def test_background_refresher_keeps_token_fresh(self) -> None:
+        """Позитивный: фоновый поток обновляет токен, пока он не истек."""
+        server = TokenServer(expires_in=1)
+        auth = make_auth(server, refresh_skew=0.0)
+        auth._fetch_token()
+
+        auth.start_refresher(interval=0.05, refresh_ahead=0.5)
+        try:
+            time.sleep(0.8)
+        finally:
+            auth.close()
+
+        assert server.calls >= self.TWO_CALLS
+        assert auth._refresher is None
+
+    def test_client_credentials_token_shared_across_clients(self) -> None:
+        """Позитивный: сервисный токен запрашивается один раз для всех клиентов процесса."""
+        server = TokenServer(expires_in=self.EXPIRES_IN)
+        forms: list[dict[str, list[str]]] = []
+
+        def token_endpoint(request: httpx.Request) -> httpx.Response:
+            forms.append(parse_qs(request.content.decode(), keep_blank_values=True))
+            return server(request)
+
+        def api(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(httpx.codes.OK, json={"authorization": request.headers["Authorization"]})
+
+        for _ in range(self.TWO_CALLS):
+            auth = BearerTokenAuth.client_credentials(
+                token_url=TOKEN_URL,
+                client_id="service",
+                client_secret="service-secret",
+                transport=httpx.MockTransport(token_endpoint),
+            )
+            with HttpClient(
+                base_url="https://api.example.com",
+                auth=auth,
+                handlers=[CurlHandler()],
+                transport=httpx.MockTransport(api),
+            ) as client:
+                assert client.get("/items").json() == {"authorization": "Bearer token-1"}
+
+        assert server.calls == 1
+        assert forms == [
+            {"grant_type": ["client_credentials"], "client_id": ["service"], "client_secret": ["service-secret"]}
+        ]
+
+
+def make_jwt(claims: dict[str, Any]) -> str:
+    """Собирает неподписанный JWT с указанными claims.
+
+    Returns:
+        Токен в формате header.payload.signature.
+    """
+
+    def encode(data: dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+    return f"{encode({'alg': 'none'})}.{encode(claims)}.signature"
+
+
+class TestJwtExpiry:
+    """Тесты чтения времени истечения из JWT."""
+
+    EXP = 1_000_300
+    EXPIRES_IN = 60
+    NOW = 1_000_000.0
+
+    def test_exp_claim_drives_cache_expiry(self) -> None:
+        """Позитивный: без expires_in время истечения берется из claim exp."""
+        access_token = make_jwt({"sub": "user", "exp": self.EXP})
+        refresh_token = make_jwt({"exp": self.EXP * 2})
+        token_data = {"access_token": access_token, "refresh_token": refresh_token}
+
+        token = CachedToken.from_token_response(token_data, now=self.NOW, decode_jwt_exp=True)
+
+        assert token.expires_at == self.EXP
+        assert token.refresh_expires_at == self.EXP * 2
+        assert CachedToken.from_token_response(token_data, now=self.NOW).expires_at is None
+
+    def test_expires_in_has_priority_over_exp(self) -> None:
+        """Позитивный: expires_in из ответа важнее claim exp."""
+        token_data = {"access_token": make_jwt({"exp": self.EXP}), "expires_in": self.EXPIRES_IN}
+
+        token = CachedToken.from_token_response(token_data, now=self.NOW, decode_jwt_exp=True)
+
+        assert token.expires_at == self.NOW + self.EXPIRES_IN
+
+    @pytest.mark.parametrize("token", ["opaque-token", "a.b.c", make_jwt({"sub": "user"}), make_jwt({"exp": "soon"})])
+    def test_not_jwt_or_without_exp(self, token: str) -> None:
+        """Негативный: для непрозрачных токенов и JWT без exp время неизвестно."""
+        assert jwt_expiry(token) is None
+
+
+class TestMemoryTokenStore:
+    """Тесты для MemoryTokenStore."""
+
+    MAX_SIZE = 2
+    TTL = 60.0
+    NOW = 1_000_000.0
+
+    def test_lru_eviction_and_stats(self) -> None:
+        """Позитивный: при переполнении вытесняется давно не использованная запись."""
+        store = MemoryTokenStore(max_size=self.MAX_SIZE)
+        token = CachedToken("token", issued_at=time.time())
+        store.set("first", token)
+        store.set("second", token)
+        assert store.get("first") == token
+
+        store.set("third", token)
+
+        assert store.get("second") is None
+        assert store.get("first") == store.get("third") == token
+        assert store.stats() == TokenCacheStats(hits=3, misses=1, evictions=1, size=2)
+
+    def test_ttl_and_expired_tokens_are_evicted(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Позитивный: записи старше ttl и полностью истекшие токены вытесняются."""
+        monkeypatch.setattr(token_cache.time, "time", lambda: self.NOW)
+        store = MemoryTokenStore(ttl=self.TTL)
+        store.set("forever", CachedToken("forever", issued_at=self.NOW))
+        store.set("expired", CachedToken("expired", issued_at=self.NOW - 20, expires_at=self.NOW - 10))
+        store.set(
+            "refreshable", CachedToken("old", issued_at=self.NOW - 20, expires_at=self.NOW - 10, refresh_token="r")
+        )
+
+        assert store.get("expired") is None
+        assert store.get("refreshable") is not None
+
+        monkeypatch.setattr(token_cache.time, "time", lambda: self.NOW + self.TTL)
+        assert store.get("forever") is None
+        assert store.stats().evictions == self.MAX_SIZE
+
+    def test_cache_key_is_scoped_by_realm(self) -> None:
+        """Позитивный: один пользователь на разных стендах получает разные токены."""
+        server = TokenServer()
+        first = make_auth(server)
+        second = make_auth(server, scope="other")
+
+        assert first._fetch_token() != second._fetch_token()
+        assert "admin-password" not in first._cache_key()
+        assert first.cache_stats().size == self.MAX_SIZE
+
+
+class TestSqliteTokenStore:
+    """Тесты для SqliteTokenStore."""
+
+    KEY = "user-key"
+    LOCK_HOLD = 0.2
+    DIRECTORY_MODE = 0o700
+    FILE_MODE = 0o600
+
+    def test_token_shared_between_store_instances(self, tmp_path: Path) -> None:
+        """Позитивный: токен, полученный через одно хранилище, виден другому на том же файле."""
+        server = TokenServer()
+        path = tmp_path / "tokens.sqlite3"
+        first = make_auth(server, token_store=SqliteTokenStore(path))
+        second = make_auth(server, token_store=SqliteTokenStore(path))
+
+        assert first._fetch_token() == second._fetch_token() == "token-1"
+        assert server.calls == 1
+        assert b"admin-password" not in path.read_bytes()
+
+    def test_expired_entries_are_purged(self, tmp_path: Path) -> None:
+        """Позитивный: полностью истекшие записи удаляются при записи."""
+        store = SqliteTokenStore(tmp_path / "tokens.sqlite3")
+        now = time.time()
+        store.set("expired", CachedToken("old", issued_at=now - 20, expires_at=now - 10))
+        store.set(self.KEY, CachedToken("new", issued_at=now, expires_at=now + 10))
+
+        assert store.get("expired") is None
+        assert store.get(self.KEY) == CachedToken("new", issued_at=now, expires_at=now + 10)
+
+    def test_lock_is_exclusive_between_store_instances(self, tmp_path: Path) -> None:
+        """Позитивный: блокировка ключа ждет, пока ее освободит другой владелец."""
+        path = tmp_path / "tokens.sqlite3"
+        holder, waiter = SqliteTokenStore(path), SqliteTokenStore(path)
+        acquired = threading.Event()
+
+        def hold() -> None:
+            with holder.lock(self.KEY):
+                acquired.set()
+                time.sleep(self.LOCK_HOLD)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        acquired.wait()
+        started = time.monotonic()
+        with waiter.lock(self.KEY):
+            waited = time.monotonic() - started
+        thread.join()
+
+        assert waited >= self.LOCK_HOLD / 2
+
+    def test_files_are_private(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Позитивный: база и файлы журнала -wal и -shm создаются с правами 0600."""
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        previous_umask = os.umask(0o022)
+        try:
+            store = SqliteTokenStore()
+            store.set(self.KEY, CachedToken("secret-token", issued_at=time.time()))
+        finally:
+            os.umask(previous_umask)
+
+        directory = tmp_path / f"pt-http-client-{os.getuid()}"
+        assert store.path.parent == directory
+        assert stat.S_IMODE(directory.stat().st_mode) == self.DIRECTORY_MODE
+        for suffix in ("", "-wal", "-shm"):
+            assert stat.S_IMODE(Path(f"{store.path}{suffix}").stat().st_mode) == self.FILE_MODE
+
+    def test_foreign_file_is_refused(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Негативный: файл другого пользователя или ссылка не используются."""
+        path = tmp_path / "tokens.sqlite3"
+        path.touch()
+        monkeypatch.setattr(token_cache, "_current_uid", lambda: os.getuid() + 1)
+
+        with pytest.raises(PermissionError, match="не принадлежит текущему пользователю"):
+            SqliteTokenStore(path)
+
+        monkeypatch.undo()
+        link = tmp_path / "link.sqlite3"
+        link.symlink_to(path)
+        with pytest.raises(OSError, match="link"):
+            SqliteTokenStore(link)
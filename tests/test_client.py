@@ -1,9 +1,14 @@
+import subprocess  # noqa: S404
+import sys
+import threading
+import time
+
 import allure
 import httpx
 import pytest
 from tenacity import RetryError, retry, retry_if_result, stop_after_attempt, wait_fixed
 
-from pt_http_client import HttpClient
+from pt_http_client import HttpClient, RequestSpec
 from pt_http_client.event_hooks.curl_handler import CurlHandler
 
 
@@ -86,3 +91,151 @@ class TestHttpClient:
             with allure.step("POST с JSON"):
                 response = client.post("/posts", json={"title": "Test", "body": "Content", "userId": self.USER_ID_1})
                 assert response.status_code == httpx.codes.CREATED
+
+
+class TestHttpClientBatch:
+    """Тесты пакетного выполнения запросов."""
+
+    BASE_URL = "https://api.example.com"
+    REQUESTS_COUNT = 40
+    MAX_WORKERS = 4
+
+    def test_batch_keeps_order_and_limits_concurrency(self) -> None:
+        """Позитивный: ответы в порядке запросов, параллельность ограничена."""
+        lock = threading.Lock()
+        in_flight = 0
+        max_in_flight = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.005)
+            with lock:
+                in_flight -= 1
+            return httpx.Response(httpx.codes.CREATED, json={"path": request.url.path})
+
+        specs = [RequestSpec("POST", f"/posts/{i}", json={"id": i}) for i in range(self.REQUESTS_COUNT)]
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[CurlHandler()], transport=httpx.MockTransport(handler)
+        ) as client:
+            responses = client.batch(specs, max_workers=self.MAX_WORKERS)
+
+        assert [response.json()["path"] for response in responses] == [spec.url for spec in specs]
+        assert 1 < max_in_flight <= self.MAX_WORKERS
+
+    def test_as_completed_yields_every_index(self) -> None:
+        """Позитивный: as_completed отдает все ответы с индексами запросов."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(httpx.codes.OK, json={"path": request.url.path})
+
+        specs = [RequestSpec("GET", f"/posts/{i}") for i in range(self.REQUESTS_COUNT)]
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[CurlHandler()], transport=httpx.MockTransport(handler)
+        ) as client:
+            results = dict(client.as_completed(specs, max_workers=self.MAX_WORKERS))
+
+        assert sorted(results) == list(range(self.REQUESTS_COUNT))
+        assert all(results[i].json()["path"] == specs[i].url for i in results)
+
+    def test_batch_raises_first_error(self) -> None:
+        """Негативный: ошибка запроса пробрасывается из batch."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("connection refused", request=request)
+
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[CurlHandler()], transport=httpx.MockTransport(handler)
+        ) as client:
+            with pytest.raises(httpx.ConnectError):
+                client.batch([RequestSpec("GET", "/posts/1")])
+
+
+class TestHttpClientStream:
+    """Тесты потокового чтения ответов HttpClient.stream."""
+
+    BASE_URL = "https://api.example.com"
+    LINES_COUNT = 1000
+    RETRY_ATTEMPTS = 3
+
+    def _export(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(httpx.codes.OK, content=(f"line {i}\n".encode() for i in range(self.LINES_COUNT)))
+
+    def test_stream_lines(self) -> None:
+        """Позитивный: тело читается по строкам и не загружается целиком."""
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[CurlHandler()], transport=httpx.MockTransport(self._export)
+        ) as client:
+            with client.stream("GET", "/export", params={"format": "csv"}) as response:
+                lines = list(response.iter_lines())
+
+        assert lines == [f"line {i}" for i in range(self.LINES_COUNT)]
+        assert response.request.url.params["format"] == "csv"
+        assert response.is_closed
+        with pytest.raises(httpx.ResponseNotRead):
+            _ = response.content
+
+    def test_stream_retry_closes_rejected_responses(self) -> None:
+        """Позитивный: retry повторяет запрос и закрывает ответы отклоненных попыток."""
+        responses: list[httpx.Response] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = httpx.codes.SERVICE_UNAVAILABLE if len(responses) < self.RETRY_ATTEMPTS - 1 else httpx.codes.OK
+            responses.append(httpx.Response(status, content=iter([b"data"])))
+            return responses[-1]
+
+        retry_decorator = retry(
+            retry=retry_if_result(lambda response: response.status_code != httpx.codes.OK),
+            stop=stop_after_attempt(self.RETRY_ATTEMPTS),
+        )
+
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[CurlHandler()], transport=httpx.MockTransport(handler)
+        ) as client:
+            with client.stream("GET", "/export", retry=retry_decorator) as response:
+                assert [item.is_closed for item in responses] == [True, True, False]
+                assert response.read() == b"data"
+
+        assert len(responses) == self.RETRY_ATTEMPTS
+        assert response.status_code == httpx.codes.OK
+
+    def test_stream_closes_on_error(self) -> None:
+        """Негативный: ответ закрывается, если блок with завершился ошибкой.
+
+        Raises:
+            ValueError: Ошибка внутри блока with.
+        """
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[CurlHandler()], transport=httpx.MockTransport(self._export)
+        ) as client:
+            with pytest.raises(ValueError, match="stop"), client.stream("GET", "/export") as response:
+                raise ValueError("stop")
+
+        assert response.is_closed
+
+
+class TestPackageImport:
+    """Тесты импорта пакета."""
+
+    def test_import_does_not_load_report_dependencies(self) -> None:
+        """Позитивный: импорт пакета не загружает allure и curlify2 до создания обработчиков."""
+        code = (
+            "import sys, pt_http_client; "
+            "assert not {'allure', 'curlify2'} & set(sys.modules); "
+            "pt_http_client.HttpClient(base_url='https://api.example.com'); "
+            "assert {'allure', 'curlify2'} <= set(sys.modules)"
+        )
+
+        subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+
+    def test_import_does_not_load_concurrency_modules(self) -> None:
+        """Позитивный: импорт пакета не загружает asyncio и concurrent.futures."""
+        code = (
+            "import sys, pt_http_client; "
+            "pt_http_client.HttpClient(base_url='https://api.example.com', profile='production'); "
+            "assert not {'asyncio', 'concurrent.futures'} & set(sys.modules), sorted(sys.modules)"
+        )
+
+        subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
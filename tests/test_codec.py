@@ -0,0 +1,135 @@
+from typing import Any, ClassVar
+
+import allure
+import httpx
+import pytest
+
+from pt_http_client import HttpClient, parsed_body
+from pt_http_client.codec import StdlibJsonCodec, get_codec
+from pt_http_client.event_hooks.allure_handler import AllureHandler
+from pt_http_client.event_hooks.curl_handler import CurlHandler
+
+
+class RecordingCodec(StdlibJsonCodec):
+    """Кодек stdlib, запоминающий вызовы."""
+
+    name = "recording"
+
+    def __init__(self) -> None:
+        """Инициализирует список вызовов."""
+        self.calls: list[str] = []
+
+    def dumps(self, obj: Any) -> bytes:
+        """Запоминает вызов и кодирует объект.
+
+        Returns:
+            JSON в байтах.
+        """
+        self.calls.append("dumps")
+        encoded: bytes = super().dumps(obj)
+        return encoded
+
+    def loads(self, data: bytes | str) -> Any:
+        """Запоминает вызов и разбирает JSON.
+
+        Returns:
+            Разобранный объект.
+        """
+        self.calls.append("loads")
+        return super().loads(data)
+
+    def dumps_pretty(self, obj: Any) -> str:
+        """Запоминает вызов и форматирует объект.
+
+        Returns:
+            Форматированный JSON.
+        """
+        self.calls.append("dumps_pretty")
+        formatted: str = super().dumps_pretty(obj)
+        return formatted
+
+
+class TestJsonCodec:
+    """Тесты кодеков JSON."""
+
+    BASE_URL = "https://api.example.com"
+    PAYLOAD: ClassVar[dict[object, object]] = {"name": "Иван", "ids": [1, 2, 3], 1: None}
+    ENCODED: ClassVar[dict[str, object]] = {"name": "Иван", "ids": [1, 2, 3], "1": None}
+
+    @pytest.mark.parametrize("name", ["stdlib", "orjson", "msgspec"])
+    def test_round_trip(self, name: str) -> None:
+        """Позитивный: все кодеки одинаково кодируют и разбирают JSON."""
+        if name != "stdlib":
+            pytest.importorskip(name)
+        codec = get_codec(name)
+
+        assert codec.loads(codec.dumps(self.PAYLOAD)) == self.ENCODED
+        assert codec.loads(codec.dumps_pretty(self.PAYLOAD)) == self.ENCODED
+        assert '\n  "name": "Иван"' in codec.dumps_pretty(self.PAYLOAD)
+
+    @pytest.mark.parametrize("name", ["stdlib", "orjson", "msgspec"])
+    def test_invalid_json(self, name: str) -> None:
+        """Негативный: некорректный JSON вызывает ValueError."""
+        if name != "stdlib":
+            pytest.importorskip(name)
+
+        with pytest.raises(ValueError):
+            get_codec(name).loads(b"not json")
+
+    def test_unknown_codec(self) -> None:
+        """Негативный: неизвестный кодек вызывает ValueError."""
+        with pytest.raises(ValueError, match="Неизвестный кодек"):
+            get_codec("simplejson")
+
+    def test_client_uses_codec(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Позитивный: кодек клиента кодирует запрос, разбирает ответ и форматирует вложения."""
+        codec = RecordingCodec()
+        monkeypatch.setattr(allure, "attach", lambda body, name, attachment_type: None)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(httpx.codes.OK, stream=httpx.ByteStream(request.content))
+
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[AllureHandler()], codec=codec, transport=httpx.MockTransport(handler)
+        ) as client:
+            response = client.post("/users", json={"name": "Иван"})
+
+        assert response.request.headers["Content-Type"] == "application/json"
+        assert response.request.content == '{"name":"Иван"}'.encode()
+        assert parsed_body(response) == {"name": "Иван"}
+        assert codec.calls == ["dumps", "loads", "dumps_pretty", "loads", "dumps_pretty"]
+
+    def test_content_type_is_not_overridden(self) -> None:
+        """Позитивный: заданный заголовок Content-Type сохраняется."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(httpx.codes.OK, text=request.headers["content-type"])
+
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[CurlHandler()], transport=httpx.MockTransport(handler)
+        ) as client:
+            response = client.post("/users", headers={"content-type": "application/merge-patch+json"}, json={})
+
+        assert response.text == "application/merge-patch+json"
+
+    @pytest.mark.parametrize(
+        ("body", "expected"),
+        [
+            ({"content": b"raw"}, b"raw"),
+            ({"data": {"name": "form"}}, b"name=form"),
+        ],
+    )
+    def test_explicit_body_has_priority_over_json(self, body: dict[str, object], expected: bytes) -> None:
+        """Позитивный: content и data, переданные вместе с json, отправляются как в httpx."""
+        codec = RecordingCodec()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(httpx.codes.OK, content=request.content)
+
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[CurlHandler()], codec=codec, transport=httpx.MockTransport(handler)
+        ) as client:
+            response = client.post("/users", json={"name": "json"}, **body)
+
+        assert response.content == expected
+        assert "dumps" not in codec.calls
@@ -0,0 +1,627 @@
+import asyncio
+import gc
+import gzip
+import json
+import logging
+import subprocess  # noqa: S404
+import sys
+import threading
+import weakref
+from collections.abc import AsyncIterator
+from functools import partial
+
+import allure
+import httpx
+import pytest
+from allure_commons import reporter
+
+from pt_http_client import AsyncHttpClient, HttpClient, parsed_body
+from pt_http_client import body as body_module
+from pt_http_client.body import is_body_parsed
+from pt_http_client.codec import JsonCodec
+from pt_http_client.event_hooks import profiles
+from pt_http_client.event_hooks.abstract_hook_handler import AbstractHookHandler
+from pt_http_client.event_hooks.allure_handler import AllureHandler
+from pt_http_client.event_hooks.background_handler import BackgroundHandler
+from pt_http_client.event_hooks.curl_handler import CurlHandler
+from pt_http_client.event_hooks.deferred_handler import DeferredAttachmentHandler
+from pt_http_client.event_hooks.logging_handler import LoggingHandler
+from pt_http_client.event_hooks.profiles import PROFILES, build_handlers, register_profile
+
+
+class TestHandlerProfiles:
+    """Тесты профилей обработчиков по умолчанию."""
+
+    BASE_URL = "https://api.example.com"
+
+    def test_default_profile_keeps_handlers(self) -> None:
+        """Позитивный: без параметров клиент использует Allure, cURL и лог."""
+        client = HttpClient(base_url=self.BASE_URL)
+
+        assert [type(handler).__name__ for handler in client._handlers] == [
+            "AllureHandler",
+            "CurlHandler",
+            "LoggingHandler",
+        ]
+
+    def test_production_profile_does_not_load_report_dependencies(self) -> None:
+        """Позитивный: профиль production не загружает allure и curlify2."""
+        code = (
+            "import sys, pt_http_client; "
+            "pt_http_client.HttpClient(base_url='https://api.example.com', profile='production'); "
+            "assert not {'allure', 'curlify2'} & set(sys.modules)"
+        )
+
+        subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+
+    def test_production_profile_logs_status_without_body(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Позитивный: профиль production пишет в лог только статус ответа."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(httpx.codes.OK, json={"secret": "body"})
+
+        caplog.set_level(logging.DEBUG)
+        with HttpClient(base_url=self.BASE_URL, profile="production", transport=httpx.MockTransport(handler)) as client:
+            client.get("/users/1")
+
+        assert "Ответ: 200 GET https://api.example.com/users/1" in caplog.messages
+        assert not any("secret" in message for message in caplog.messages)
+
+    def test_handlers_override_profile(self) -> None:
+        """Позитивный: явно переданные обработчики важнее профиля."""
+        handler = LoggingHandler()
+
+        client = HttpClient(base_url=self.BASE_URL, handlers=[handler], profile="debug")
+
+        assert client._handlers == [handler]
+
+    def test_register_profile(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Позитивный: зарегистрированный профиль доступен клиенту."""
+        monkeypatch.setattr(profiles, "PROFILES", dict(PROFILES))
+
+        register_profile("quiet", lambda: [LoggingHandler(log_body=False)])
+        client = HttpClient(base_url=self.BASE_URL, profile="quiet")
+
+        assert len(client._handlers) == 1
+
+    def test_unknown_profile(self) -> None:
+        """Негативный: неизвестный профиль вызывает ValueError."""
+        with pytest.raises(ValueError, match="Неизвестный профиль"):
+            build_handlers("staging")
+
+
+class TestDeferredAttachments:
+    """Тесты режима failures_only у AllureHandler и CurlHandler."""
+
+    BASE_URL = "https://api.example.com"
+    BUFFER_SIZE = 4
+    REQUESTS_COUNT = 10
+    MAX_BODY_LENGTH = 100
+    LARGE_BODY_LENGTH = 1_000_000
+
+    @pytest.fixture
+    def attachments(self, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+        """Подменяет allure.attach.
+
+        Returns:
+            Имена прикрепленных вложений.
+        """
+        names: list[str] = []
+        monkeypatch.setattr(allure, "attach", lambda body, name, attachment_type: names.append(name))
+        return names
+
+    @staticmethod
+    def _handler(request: httpx.Request) -> httpx.Response:
+        status = httpx.codes.NOT_FOUND if request.url.path == "/missing" else httpx.codes.OK
+        return httpx.Response(status, stream=httpx.ByteStream(request.url.path.encode()))
+
+    def _client(self, *handlers: DeferredAttachmentHandler) -> HttpClient:
+        return HttpClient(base_url=self.BASE_URL, handlers=list(handlers), transport=httpx.MockTransport(self._handler))
+
+    def test_default_mode_attaches_every_exchange(self, attachments: list[str]) -> None:
+        """Позитивный: без failures_only вложения прикрепляются сразу."""
+        with self._client(AllureHandler(), CurlHandler()) as client:
+            client.get("/users/1")
+
+        assert attachments == [
+            "Request: GET /users/1",
+            "cURL Command: GET /users/1",
+            "Response: GET https://api.example.com/users/1",
+        ]
+
+    def test_success_is_not_attached(self, attachments: list[str]) -> None:
+        """Позитивный: успешные обмены только буферизуются."""
+        handler = AllureHandler(failures_only=True, buffer_size=self.BUFFER_SIZE)
+
+        with self._client(handler, CurlHandler(failures_only=True)) as client:
+            for i in range(self.REQUESTS_COUNT):
+                client.get(f"/users/{i}")
+
+        assert attachments == []
+        assert len(handler._pending) == self.BUFFER_SIZE
+
+    def test_error_response_flushes_last_exchanges(self, attachments: list[str]) -> None:
+        """Позитивный: ответ с ошибкой прикрепляет последние обмены из буфера."""
+        handler = AllureHandler(failures_only=True, buffer_size=self.BUFFER_SIZE)
+
+        with self._client(handler) as client:
+            for i in range(self.REQUESTS_COUNT):
+                client.get(f"/users/{i}")
+            client.get("/missing")
+
+        assert attachments == [
+            *(
+                name
+                for i in range(self.REQUESTS_COUNT - self.BUFFER_SIZE + 1, self.REQUESTS_COUNT)
+                for name in (f"Request: GET /users/{i}", f"Response: GET https://api.example.com/users/{i}")
+            ),
+            "Request: GET /missing",
+            "Response: GET https://api.example.com/missing",
+        ]
+        assert not handler._pending
+
+    def test_binary_request_body_is_attached(self, attachments: list[str]) -> None:
+        """Позитивный: тело запроса не в UTF-8 прикрепляется с заменой некорректных байт."""
+        with self._client(AllureHandler(failures_only=True)) as client:
+            client.post("/upload", content=b"\x89PNG\r\n\x1a\n")
+
+        assert DeferredAttachmentHandler.flush_all() == len(attachments) == len(["request", "response"])
+
+    def test_render_error_does_not_stop_flush(
+        self, attachments: list[str], monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Негативный: ошибка одного вложения логируется, остальные вложения прикрепляются."""
+
+        def broken(self: AllureHandler, request: object) -> None:
+            raise RuntimeError("broken")
+
+        monkeypatch.setattr(AllureHandler, "_attach_request", broken)
+
+        with self._client(AllureHandler(failures_only=True), CurlHandler(failures_only=True)) as client:
+            client.get("/users/1")
+
+        assert DeferredAttachmentHandler.flush_all() == len(attachments) == len(["response", "curl"])
+        assert "Не удалось сформировать вложение AllureHandler" in caplog.text
+
+    def test_buffer_does_not_keep_exchanges_alive(self, attachments: list[str]) -> None:
+        """Позитивный: буфер хранит снимки с началом тел, а не запросы и ответы."""
+        handler = AllureHandler(failures_only=True, max_body_length=self.MAX_BODY_LENGTH)
+
+        with self._client(handler, CurlHandler(failures_only=True, max_body_length=self.MAX_BODY_LENGTH)) as client:
+            response = client.post("/upload", content=b"x" * self.LARGE_BODY_LENGTH)
+            response_ref = weakref.ref(response)
+            del response
+            gc.collect()
+
+        assert response_ref() is None
+        request_render = handler._pending[0][0]
+        assert isinstance(request_render, partial)
+        assert len(request_render.args[0].content) == self.MAX_BODY_LENGTH
+        assert DeferredAttachmentHandler.flush_all() == len(attachments) == len(["request", "response", "curl"])
+
+    def test_flush_all(self, attachments: list[str]) -> None:
+        """Позитивный: flush_all выгружает буферы всех обработчиков."""
+        with self._client(AllureHandler(failures_only=True), CurlHandler(failures_only=True)) as client:
+            client.get("/users/1")
+
+        flushed = DeferredAttachmentHandler.flush_all()
+
+        assert flushed == len(attachments) == len(["request", "response", "curl"])
+        assert "cURL Command: GET /users/1" in attachments
+
+    def test_pytest_plugin_flushes_on_failure(self, pytester: pytest.Pytester) -> None:
+        """Позитивный: плагин прикрепляет отложенные вложения только упавших тестов."""
+        pytester.makepyfile(
+            """
+            import allure
+            import httpx
+            import pytest
+
+            from pt_http_client import AsyncHttpClient, HttpClient, parsed_body
+            from pt_http_client.event_hooks.curl_handler import CurlHandler
+
+
+            @pytest.fixture(autouse=True)
+            def record(monkeypatch, request):
+                def attach(body, name, attachment_type):
+                    with open("attachments.txt", "a") as file:
+                        file.write(f"{request.node.name}: {name}\\n")
+
+                monkeypatch.setattr(allure, "attach", attach)
+
+
+            @pytest.mark.parametrize("fail", [False, True])
+            def test_request(fail):
+                transport = httpx.MockTransport(lambda request: httpx.Response(200))
+                handlers = [CurlHandler(failures_only=True)]
+                with HttpClient(base_url="https://api.example.com", handlers=handlers, transport=transport) as client:
+                    client.get("/users/1")
+                assert not fail
+            """
+        )
+
+        result = pytester.runpytest()
+
+        result.assert_outcomes(passed=1, failed=1)
+        assert (pytester.path / "attachments.txt").read_text().splitlines() == [
+            "test_request[True]: cURL Command: GET /users/1"
+        ]
+
+
+class TestParsedBody:
+    """Тесты однократного разбора тела ответа."""
+
+    BASE_URL = "https://api.example.com"
+
+    @staticmethod
+    def _handler(request: httpx.Request) -> httpx.Response:
+        content = b'{"id": 1}' if request.url.path == "/json" else b"plain text"
+        return httpx.Response(httpx.codes.OK, stream=httpx.ByteStream(content))
+
+    def test_body_is_parsed_once(self, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
+        """Позитивный: обработчики и вызывающий код разбирают тело один раз."""
+        calls: list[bytes] = []
+        original_parse = body_module._parse_content
+
+        def counting_parse(content: bytes, charset: str | None, codec: JsonCodec) -> object:
+            calls.append(content)
+            return original_parse(content, charset, codec)
+
+        monkeypatch.setattr(body_module, "_parse_content", counting_parse)
+        monkeypatch.setattr(allure, "attach", lambda body, name, attachment_type: None)
+        caplog.set_level(logging.DEBUG)
+
+        with HttpClient(
+            base_url=self.BASE_URL,
+            handlers=[AllureHandler(), LoggingHandler()],
+            transport=httpx.MockTransport(self._handler),
+        ) as client:
+            response = client.get("/json")
+
+        assert parsed_body(response) == {"id": 1}
+        assert calls == [b'{"id": 1}']
+
+    def test_text_body(self) -> None:
+        """Позитивный: тело не в формате JSON возвращается текстом."""
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[LoggingHandler()], transport=httpx.MockTransport(self._handler)
+        ) as client:
+            response = client.get("/text")
+
+        assert parsed_body(response) == "plain text"
+
+
+class TestTruncateBody:
+    """Тесты ограниченного обрезания тел в обработчиках."""
+
+    BASE_URL = "https://api.example.com"
+    MAX_BODY_LENGTH = 100
+    ITEMS_COUNT = 100_000
+
+    def test_short_body_is_unchanged(self) -> None:
+        """Позитивный: короткое тело возвращается без изменений."""
+        body = {"id": 1, "tags": ["a", "b"]}
+
+        assert LoggingHandler(max_body_length=self.MAX_BODY_LENGTH)._truncate_body(body) is body
+
+    def test_long_body_matches_str_prefix(self) -> None:
+        """Позитивный: обрезанное тело совпадает с началом str(data)."""
+        body = {"items": [{"id": i, "name": f"user{i}", "active": i % 2 == 0} for i in range(self.ITEMS_COUNT)]}
+        handler = LoggingHandler(max_body_length=self.MAX_BODY_LENGTH)
+
+        truncated = handler._truncate_body(body)
+
+        assert truncated == str(body)[: self.MAX_BODY_LENGTH] + handler.TRUNCATE_MESSAGE
+
+    def test_long_string_is_truncated(self) -> None:
+        """Позитивный: длинная строка обрезается до лимита."""
+        handler = LoggingHandler(max_body_length=self.MAX_BODY_LENGTH)
+
+        assert handler._truncate_body("x" * self.ITEMS_COUNT) == "x" * self.MAX_BODY_LENGTH + handler.TRUNCATE_MESSAGE
+
+    def test_large_response_is_not_parsed(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Позитивный: тело длиннее лимита не разбирается, в лог идет его начало."""
+        content = json.dumps([{"id": i} for i in range(self.ITEMS_COUNT // 10)]).encode()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(httpx.codes.OK, stream=httpx.ByteStream(content))
+
+        caplog.set_level(logging.DEBUG)
+        with HttpClient(
+            base_url=self.BASE_URL,
+            handlers=[LoggingHandler(max_body_length=self.MAX_BODY_LENGTH)],
+            transport=httpx.MockTransport(handler),
+        ) as client:
+            response = client.get("/users")
+
+        assert not is_body_parsed(response)
+        assert content[: self.MAX_BODY_LENGTH].decode() in caplog.text
+
+
+class TestStreamingHooks:
+    """Тесты обработчиков на потоковых ответах."""
+
+    BASE_URL = "https://api.example.com"
+    CHUNK = b"x" * 65536
+    CHUNKS_COUNT = 200
+    MAX_BODY_LENGTH = 1000
+
+    def _download(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(httpx.codes.OK, content=(self.CHUNK for _ in range(self.CHUNKS_COUNT)))
+
+    def test_stream_is_not_buffered(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Позитивный: обработчики не читают потоковый ответ и видят его размер."""
+        attachments: list[str] = []
+        monkeypatch.setattr(allure, "attach", lambda body, name, attachment_type: attachments.append(body))
+        handlers = [
+            AllureHandler(max_body_length=self.MAX_BODY_LENGTH),
+            LoggingHandler(max_body_length=self.MAX_BODY_LENGTH),
+        ]
+
+        with HttpClient(base_url=self.BASE_URL, handlers=handlers, transport=httpx.MockTransport(self._download)) as c:
+            with c.stream("GET", "/file") as response:
+                assert len(attachments) == 1
+                received = sum(len(chunk) for chunk in response.iter_bytes())
+
+        capture = response.extensions["pt_http_client.body_capture"]
+        response_info = json.loads(attachments[-1])
+        assert received == capture.size == response_info["size"] == len(self.CHUNK) * self.CHUNKS_COUNT
+        assert response_info["headers"] == dict(response.headers)
+        assert len(capture._prefix) == self.MAX_BODY_LENGTH + 1
+        assert "x" * self.MAX_BODY_LENGTH + AllureHandler.TRUNCATE_MESSAGE in response_info["body"]
+        with pytest.raises(httpx.ResponseNotRead):
+            _ = response.content
+
+    def test_gzip_body_is_decoded(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Позитивный: тело со сжатием gzip разбирается в логе."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            content = gzip.compress(b'{"id": 1}')
+            return httpx.Response(httpx.codes.OK, headers={"Content-Encoding": "gzip"}, content=iter([content]))
+
+        caplog.set_level(logging.DEBUG)
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[LoggingHandler()], transport=httpx.MockTransport(handler)
+        ) as client:
+            response = client.get("/users/1")
+
+        assert response.json() == parsed_body(response) == {"id": 1}
+        assert "'body': {'id': 1}" in caplog.text
+
+    def test_async_stream_is_not_buffered(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Позитивный: асинхронный клиент не дочитывает потоковый ответ в хуке."""
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for _ in range(self.CHUNKS_COUNT):
+                await asyncio.sleep(0)
+                yield self.CHUNK
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(httpx.codes.OK, content=chunks())
+
+        async def run() -> int:
+            async with AsyncHttpClient(
+                base_url=self.BASE_URL,
+                handlers=[LoggingHandler(max_body_length=self.MAX_BODY_LENGTH)],
+                transport=httpx.MockTransport(handler),
+            ) as client:
+                async with client.stream("GET", "/file") as response:
+                    return sum([len(chunk) async for chunk in response.aiter_bytes()])
+
+        caplog.set_level(logging.DEBUG)
+
+        assert asyncio.run(run()) == len(self.CHUNK) * self.CHUNKS_COUNT
+        assert AllureHandler.TRUNCATE_MESSAGE in caplog.text
+        assert (
+            f"'size': {len(self.CHUNK) * self.CHUNKS_COUNT}, 'headers': {{'transfer-encoding': 'chunked'}}"
+            in caplog.text
+        )
+
+
+class SlowHandler(AbstractHookHandler):
+    """Обработчик, ждущий события перед каждым хуком и запоминающий вызовы."""
+
+    def __init__(self) -> None:
+        """Инициализирует обработчик."""
+        self.release = threading.Event()
+        self.threads: set[str] = set()
+        self.bodies: list[object] = []
+
+    def request_hook(self, request: httpx.Request) -> None:
+        """Ждет разрешения и запоминает поток."""
+        self.release.wait()
+        self.threads.add(threading.current_thread().name)
+
+    def response_hook(self, response: httpx.Response) -> None:
+        """Ждет разрешения и запоминает тело ответа."""
+        self.release.wait()
+        self.bodies.append(response.json())
+
+
+class TestBackgroundHandler:
+    """Тесты фонового выполнения хуков BackgroundHandler."""
+
+    BASE_URL = "https://api.example.com"
+    REQUESTS_COUNT = 20
+    MAX_BACKLOG = 5
+
+    @staticmethod
+    def _handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(httpx.codes.OK, stream=httpx.ByteStream(b'{"path": "%s"}' % request.url.path.encode()))
+
+    def test_hooks_run_in_background_and_flush_on_close(self) -> None:
+        """Позитивный: хуки не задерживают запросы и выполняются до закрытия клиента."""
+        slow = SlowHandler()
+        background = BackgroundHandler(slow)
+
+        client = HttpClient(base_url=self.BASE_URL, handlers=[background], transport=httpx.MockTransport(self._handler))
+        for i in range(self.REQUESTS_COUNT):
+            client.get(f"/users/{i}")
+
+        assert slow.bodies == []
+        assert background.backlog > 0
+
+        slow.release.set()
+        client.close()
+
+        assert background.backlog == 0
+        assert slow.threads == {"http-hooks"}
+        assert slow.bodies == [{"path": f"/users/{i}"} for i in range(self.REQUESTS_COUNT)]
+
+    def test_full_queue_drops_events(self) -> None:
+        """Негативный: при заполненной очереди события отбрасываются и считаются."""
+        slow = SlowHandler()
+        background = BackgroundHandler(slow, max_backlog=self.MAX_BACKLOG)
+
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[background], transport=httpx.MockTransport(self._handler)
+        ) as client:
+            for i in range(self.REQUESTS_COUNT):
+                client.get(f"/users/{i}")
+            slow.release.set()
+
+        assert background.dropped >= self.REQUESTS_COUNT
+        assert len(slow.bodies) < self.REQUESTS_COUNT
+
+    def test_queue_does_not_keep_exchanges_alive(self) -> None:
+        """Позитивный: очередь хранит снимки запросов и ответов, а не сами объекты."""
+        slow = SlowHandler()
+        background = BackgroundHandler(slow)
+
+        client = HttpClient(base_url=self.BASE_URL, handlers=[background], transport=httpx.MockTransport(self._handler))
+        try:
+            response = client.get("/users/1")
+            response_ref = weakref.ref(response)
+            del response
+            gc.collect()
+
+            assert response_ref() is None
+            assert background.backlog > 0
+        finally:
+            slow.release.set()
+            client.close()
+
+        assert slow.bodies == [{"path": "/users/1"}]
+
+    def test_errors_are_counted(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Негативный: ошибка обработчика не прерывает запрос и учитывается в errors."""
+        slow = SlowHandler()
+        slow.release.set()
+        background = BackgroundHandler(slow)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(httpx.codes.OK, stream=httpx.ByteStream(b"not json"))
+
+        with HttpClient(base_url=self.BASE_URL, handlers=[background], transport=httpx.MockTransport(handler)) as c:
+            response = c.get("/users/1")
+
+        assert response.status_code == httpx.codes.OK
+        assert background.errors == 1
+        assert "Ошибка фонового обработчика SlowHandler" in caplog.text
+
+    def test_missing_allure_internals_are_ignored(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Негативный: без внутреннего атрибута allure задачи выполняются без привязки к контексту."""
+        monkeypatch.delattr(reporter.ThreadContextItems, "_thread_context")
+        slow = SlowHandler()
+        slow.release.set()
+        background = BackgroundHandler(slow)
+
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[background], transport=httpx.MockTransport(self._handler)
+        ) as client:
+            response = client.get("/users/1")
+
+        assert response.status_code == httpx.codes.OK
+        assert slow.bodies == [{"path": "/users/1"}]
+        assert background.errors == 0
+
+    def test_allure_attachments_follow_submitting_test(self, pytester: pytest.Pytester) -> None:
+        """Позитивный: вложения из общего рабочего потока попадают в тест, отправивший запрос."""
+        pytester.makepyfile(
+            """
+            import httpx
+            import pytest
+
+            from pt_http_client import HttpClient
+            from pt_http_client.event_hooks.background_handler import BackgroundHandler
+            from pt_http_client.event_hooks.curl_handler import CurlHandler
+
+
+            @pytest.fixture(scope="module")
+            def client():
+                transport = httpx.MockTransport(lambda request: httpx.Response(200))
+                handlers = [BackgroundHandler(CurlHandler())]
+                with HttpClient(base_url="https://api.example.com", handlers=handlers, transport=transport) as client:
+                    yield client
+
+
+            @pytest.mark.parametrize("name", ["one", "two", "three"])
+            def test_request(client, name):
+                client.get(f"/{name}")
+            """
+        )
+        alluredir = pytester.path / "allure-results"
+
+        result = pytester.runpytest(f"--alluredir={alluredir}")
+
+        result.assert_outcomes(passed=3)
+        attachments = {}
+        for path in alluredir.glob("*-result.json"):
+            test_result = json.loads(path.read_text())
+            attachments[test_result["name"]] = [attachment["name"] for attachment in test_result["attachments"]]
+        assert attachments == {
+            f"test_request[{name}]": [f"cURL Command: GET /{name}"] for name in ("one", "two", "three")
+        }
+
+
+class TestLoggingHandler:
+    """Тесты уровней логирования LoggingHandler."""
+
+    BASE_URL = "https://api.example.com"
+    LOGGER = "pt_http_client.event_hooks.logging_handler"
+
+    @staticmethod
+    def _handler(request: httpx.Request) -> httpx.Response:
+        status = httpx.codes.NOT_FOUND if request.url.path == "/missing" else httpx.codes.OK
+        return httpx.Response(status, stream=httpx.ByteStream(b'{"id": 1}'))
+
+    def _get(self, path: str) -> httpx.Response:
+        with HttpClient(
+            base_url=self.BASE_URL, handlers=[LoggingHandler()], transport=httpx.MockTransport(self._handler)
+        ) as client:
+            response: httpx.Response = client.get(path, params={"page": 1})
+        return response
+
+    def test_info_level_skips_body(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Позитивный: на уровне INFO тело ответа не собирается и не разбирается."""
+        caplog.set_level(logging.INFO, logger=self.LOGGER)
+
+        response = self._get("/users/1")
+
+        assert [record.getMessage() for record in caplog.records if record.name == self.LOGGER] == [
+            "Запрос: GET https://api.example.com/users/1?page=1",
+            "Ответ: 200",
+        ]
+        assert "pt_http_client.body_capture" not in response.extensions
+        assert not is_body_parsed(response)
+
+    def test_debug_level_logs_details(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Позитивный: на уровне DEBUG пишутся параметры и тело ответа."""
+        caplog.set_level(logging.DEBUG)
+
+        self._get("/users/1")
+
+        assert "Параметры: {'page': '1'}" in caplog.messages
+        assert "'body': {'id': 1}" in caplog.messages[-1]
+
+    def test_error_is_logged_with_body_at_warning(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Негативный: ответ с ошибкой пишется с телом на уровне WARNING."""
+        caplog.set_level(logging.WARNING, logger=self.LOGGER)
+
+        self._get("/missing")
+
+        assert [record.levelno for record in caplog.records if record.name == self.LOGGER] == [
+            logging.WARNING,
+            logging.WARNING,
+        ]
+        assert "'body': {'id': 1}" in caplog.messages[-1]